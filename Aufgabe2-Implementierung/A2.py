@@ -5,10 +5,16 @@
 from __future__ import annotations
 import sys
 import argparse
-from itertools import chain
-from typing import TextIO, Iterator, Tuple, List, Dict, Set, Iterable, TypeVar, MutableSequence, MutableMapping, Mapping
-import networkx
-import bipartitematching
+import warnings
+import importlib
+from collections import defaultdict
+from itertools import chain, islice
+from functools import reduce
+from operator import or_
+from typing import BinaryIO, TextIO, Iterator, Tuple, List, Dict, Set, Iterable, TypeVar, MutableSequence, MutableMapping, Mapping, Optional
+import matching
+import counting
+import instrumentation
 
 __version__ = "0.1"
 __author__ = "Eric Wolf"
@@ -37,6 +43,67 @@ argparser.add_argument(
     help="benutze einen alternativen Algorithmus",
     action="store_true"
 )
+argparser.add_argument(
+    "-m",
+    "--matching",
+    help="benutze einen Algorithmus mit polynomieller Laufzeit basierend auf einer maximalen Paarung",
+    action="store_true"
+)
+argparser.add_argument(
+    "-e",
+    "--engine",
+    help="Name des Algorithmus (backtracking, uno, matching), überschreibt --alternative und --matching",
+    default=None
+)
+argparser.add_argument(
+    "-b",
+    "--backend",
+    help="Speicherung der Kandidaten als Mengen, Bitmasken oder boolesche Matrix",
+    choices=("set", "bitset", "numpy"),
+    default="set"
+)
+argparser.add_argument(
+    "-f",
+    "--fast",
+    help="benutze einen schnelleren Parser, welcher die Datei blockweise liest",
+    action="store_true"
+)
+argparser.add_argument(
+    "-i",
+    "--incremental",
+    help="verarbeite die Spieße einzeln und brich ab, sobald die Schüsseln der Wunschsorten feststehen",
+    action="store_true"
+)
+argparser.add_argument(
+    "-c",
+    "--components",
+    help="zerlege die Kandidaten in unabhängige Teile und löse diese einzeln",
+    action="store_true"
+)
+argparser.add_argument(
+    "-p",
+    "--processes",
+    help="Anzahl der Prozesse, auf welche die Teile verteilt werden (benötigt --components oder --subtrees)",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "-s",
+    "--subtrees",
+    help="zerlege die obersten Ebenen des Suchbaums in Teilbäume und durchsuche diese parallel",
+    action="store_true"
+)
+argparser.add_argument(
+    "--count",
+    help="zeige die Anzahl der möglichen Zuordnungen und der möglichen Schüsseln jeder Wunschsorte",
+    action="store_true"
+)
+argparser.add_argument(
+    "--profile",
+    help="zeige Laufzeiten der Phasen, Zähler der Algorithmen und den Speicherbedarf als Text oder JSON",
+    choices=("text", "json"),
+    default=None
+)
 argparser.add_argument(
     "Datei",
     type=argparse.FileType("r"),
@@ -48,6 +115,72 @@ argparser.add_argument(
 T = TypeVar("T")
 
 
+class LazyModule:
+    """Platzhalter für ein Modul, welches erst beim ersten Zugriff importiert wird"""
+    __slots__ = ("name", "module")
+
+    name: str
+
+    module: Optional[object]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.module = None
+
+    def load(self) -> object:
+        """importiere das Modul, falls dies noch nicht geschehen ist"""
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return self.module
+
+    def __getattr__(self, attribute: str) -> object:
+        return getattr(self.load(), attribute)
+
+
+# schwere Abhängigkeiten, welche nur von einigen Algorithmen und dem schnellen Parser benötigt werden
+numpy = LazyModule("numpy")
+networkx = LazyModule("networkx")
+bipartitematching = LazyModule("bipartitematching")
+
+
+class Engine:
+    """Algorithmus zum Entfernen unmöglicher Kandidaten, dessen Abhängigkeiten erst bei Bedarf geladen werden"""
+    __slots__ = ("name", "method", "modules", "description")
+
+    name: str
+
+    method: str     # Name der Methode von Candidates
+
+    modules: Tuple[LazyModule, ...]
+
+    description: str
+
+    def __init__(self, name: str, method: str, modules: Iterable[LazyModule], description: str) -> None:
+        self.name = name
+        self.method = method
+        self.modules = tuple(modules)
+        self.description = description
+
+    def load(self) -> str:
+        """lade die Abhängigkeiten und gebe den Namen der Methode zurück"""
+        for module in self.modules:
+            module.load()
+        return self.method
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine) -> None:
+    """füge einen Algorithmus der Auswahl hinzu"""
+    ENGINES[engine.name] = engine
+
+
+register_engine(Engine("backtracking", "strip_impossible", (), "Backtracking, welches nur unbestätigte Paare sucht"))
+register_engine(Engine("uno", "strip_impossible2", (networkx, bipartitematching), "Aufzählung aller maximalen Paarungen"))
+register_engine(Engine("matching", "strip_impossible3", (), "eine maximale Paarung mit Dulmage-Mendelsohn Zerlegung"))
+
+
 class InvalidDataError(ValueError):
     """Fehler, welcher bei invaliden Daten ausgelöst wird"""
     __slots__ = ()
@@ -63,6 +196,8 @@ def iter_possible(candidates: MutableSequence[Tuple[str, Set[int]]], used: Mutab
     # WARNUNG: die zurückgegebenen Zuordnungen stellen ein "Schnappschuss" des Mapping welches als 'used' übergeben wird dar.
     #          Dies bedeutet, dass diese beim weiteriterieren verändert werden können.
     #          Aus diesem Grund sollten die zurückgegebenen Mappings unverzüglich verwendet oder kopiert werden.
+    if instrumentation.profiler is not None:
+        instrumentation.profiler.node("Knoten (iter_possible)", len(used))
     try:
         fruit, bowls = candidates.pop()     # entferne noch nicht vergebe Frucht, sie wird zugeordnet
     except IndexError:
@@ -75,6 +210,210 @@ def iter_possible(candidates: MutableSequence[Tuple[str, Set[int]]], used: Mutab
         candidates.append((fruit, bowls))    # füge die eigene Frucht wieder hinzu für den nächsten rekursiven Aufruf
 
 
+def iter_witnesses(candidates: MutableSequence[Tuple[str, Set[int]]], used: MutableMapping[int, str], unconfirmed: Set[Tuple[str, int]],
+                   completion: Optional[Dict[str, int]] = None) -> Iterator[Mapping[int, str]]:
+    """wie iter_possible, jedoch werden nur Zuordnungen gefunden, welche noch unbestätigte Paare aus Frucht und Schüssel enthalten"""
+    # 'unconfirmed' muss vom Aufrufer beim Iterieren um die Paare der zurückgegebenen Zuordnungen verkleinert werden.
+    # 'completion' ist eine Zuordnung der restlichen Früchte zu freien Schüsseln, falls sie bereits bekannt ist.
+    if instrumentation.profiler is not None:
+        instrumentation.profiler.node("Knoten (iter_witnesses)", len(used))
+    residual = {fruit: bowls - used.keys() for fruit, bowls in candidates}  # Restproblem ohne die vergebenen Schüsseln
+    if completion is None:
+        completion = matching.find_matching(residual)
+        if len(completion) != len(candidates):  # die restlichen Früchte können nicht zugeordnet werden
+            return
+    allowed = matching.possible_pairs(residual, completion)    # Paare, mit welchen sich das Restproblem noch lösen lässt
+    if not used:    # alle anderen Paare sind unmöglich
+        unconfirmed.intersection_update((fruit, bowl) for fruit, bowls in allowed.items() for bowl in bowls)
+    # bevorzuge für die Zuordnung dieses Knotens möglichst viele unbestätigte Paare
+    preferred: Dict[str, int] = {}
+    taken = set()
+    for fruit, bowls in allowed.items():
+        for bowl in bowls:
+            if bowl not in taken and (fruit, bowl) in unconfirmed:
+                preferred[fruit] = bowl
+                taken.add(bowl)
+                break
+    if preferred:   # erzwinge eines der Paare, damit die Zuordnung mindestens ein neues Paar bestätigt
+        fruit, bowl = next(iter(preferred.items()))
+        witness = matching.find_matching({**residual, fruit: {bowl}}, preferred)
+    elif any((fruit, bowl) in unconfirmed for bowl, fruit in used.items()):
+        witness = completion
+    else:
+        return  # der Teilbaum kann keine neuen Paare bestätigen
+    combination = dict(used)
+    for fruit, bowl in witness.items():
+        combination[bowl] = fruit
+    yield combination   # die Zuordnung bestätigt neue Paare
+    if not preferred:
+        return  # der Teilbaum kann keine weiteren Paare bestätigen
+    open_pairs = [(fruit, bowl) for fruit, bowls in allowed.items() for bowl in bowls if (fruit, bowl) in unconfirmed]
+    fruit, bowls = candidates.pop()     # entferne noch nicht vergebe Frucht, sie wird zugeordnet
+    for bowl in allowed[fruit]:     # als Kandidaten kommen nur Schüsseln in Betracht, mit welchen das Restproblem lösbar bleibt
+        open_pairs = [pair for pair in open_pairs if pair in unconfirmed]   # Paare des Teilbaums, welche noch unbestätigt sind
+        if not open_pairs:  # alle Paare des Teilbaums sind bestätigt
+            break
+        # überspringe Teilbäume, welche keine unbestätigten Paare enthalten können
+        if (fruit, bowl) in unconfirmed or any(other != fruit and other_bowl != bowl for other, other_bowl in open_pairs):
+            used[bowl] = fruit
+            yield from iter_witnesses(candidates, used, unconfirmed, matching.find_matching(
+                {other: other_bowls - used.keys() for other, other_bowls in candidates},
+                completion
+            ))
+            used.pop(bowl)
+    candidates.append((fruit, bowls))    # füge die eigene Frucht wieder hinzu für den nächsten rekursiven Aufruf
+
+
+def find_root(parent: MutableMapping[int, int], node: int) -> int:
+    """ermittle den Repräsentanten der Menge eines Knotens (Union-Find mit Pfadkompression)"""
+    root = node
+    while parent.get(root, root) != root:
+        root = parent[root]
+    while node != root:     # verkürze den Pfad für spätere Aufrufe
+        parent[node], node = root, parent[node]
+    return root
+
+
+def solve_component(task: Tuple[Candidates, str]) -> Candidates:
+    """löse einen Teil der Kandidaten mit der angegebenen Methode, wird von den Prozessen aufgerufen"""
+    component, method = task
+    return getattr(component, method)()
+
+
+def solve_subtree(task: Tuple[Candidates, Dict[str, int], str]) -> Optional[Dict[str, Set[int]]]:
+    """löse den Teilbaum unterhalb einer teilweisen Zuordnung mit der angegebenen Methode, wird von den Prozessen aufgerufen"""
+    # gibt die möglichen Kandidaten des Teilbaums zurück oder None, falls er keine Zuordnung enthält
+    residual, prefix, method = task
+    possible: Dict[str, Set[int]] = {}
+    if residual:    # ansonsten ist die teilweise Zuordnung bereits vollständig
+        try:
+            possible.update(getattr(residual, method)())
+        except InvalidDataError:
+            return None
+    for fruit, bowl in prefix.items():
+        possible[fruit] = {bowl}
+    return possible
+
+
+class SkewerBlock:
+    """mehrere Spieße als flache Felder, beim Iterieren werden die einzelnen Spieße zurückgegeben"""
+    __slots__ = ("fruits", "bowls", "ends")
+
+    fruits: numpy.ndarray   # Früchte aller Spieße hintereinander
+
+    bowls: numpy.ndarray    # Schüsseln aller Spieße hintereinander
+
+    ends: numpy.ndarray     # Ende jedes Spießes in 'fruits' und 'bowls'
+
+    def __init__(self, fruits: numpy.ndarray, bowls: numpy.ndarray, ends: numpy.ndarray) -> None:
+        self.fruits = fruits
+        self.bowls = bowls
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __iter__(self) -> Iterator[Tuple[List[int], List[int]]]:
+        fruits = self.fruits.tolist()
+        bowls = self.bowls.tolist()
+        start = 0
+        for end in self.ends.tolist():
+            yield fruits[start:end], bowls[start:end]
+            start = end
+
+    @classmethod
+    def from_skewers(cls, fruits: Iterable[Iterable[int]], bowls: Iterable[Iterable[int]]) -> SkewerBlock:
+        """erzeuge einen Block aus den Früchten und Schüsseln einzelner Spieße"""
+        fruits = list(map(list, fruits))
+        bowls = list(map(list, bowls))
+        ends = numpy.cumsum(numpy.fromiter(map(len, fruits), dtype=numpy.int64, count=len(fruits)))
+        bowl_ends = numpy.cumsum(numpy.fromiter(map(len, bowls), dtype=numpy.int64, count=len(bowls)))
+        if not numpy.array_equal(ends, bowl_ends):
+            raise ValueError(
+                f"Anzahl der Früchte und Schüsseln bei Spieß {int(numpy.flatnonzero(ends != bowl_ends)[0])} stimmen nicht überein"
+            )
+        return cls(
+            numpy.fromiter(chain.from_iterable(fruits), dtype=numpy.int64, count=int(ends[-1]) if len(ends) else 0),
+            numpy.fromiter(chain.from_iterable(bowls), dtype=numpy.int64, count=int(ends[-1]) if len(ends) else 0),
+            ends
+        )
+
+    def skewers(self) -> numpy.ndarray:
+        """gebe den Spieß jeder Frucht und Schüssel zurück"""
+        return numpy.repeat(numpy.arange(len(self.ends)), numpy.diff(self.ends, prepend=0))
+
+    def columns(self) -> int:
+        """gebe die Anzahl der Spalten zurück, welche alle Schüsseln des Blocks enthalten"""
+        return int(self.bowls.max()) + 1 if len(self.bowls) else 1
+
+
+def check_bowls(bowls: numpy.ndarray, all_candidates: Set[int]) -> None:
+    """prüfe wie Candidates.add_skewer, ob alle Schüsseln eines Blocks existieren"""
+    if not len(bowls):
+        return
+    valid = numpy.zeros(max(all_candidates, default=-1) + 1, dtype=bool)  # Schüssel -> existiert
+    valid[numpy.fromiter(all_candidates, dtype=numpy.int64, count=len(all_candidates))] = True
+    if bowls.min() < 0 or bowls.max() >= len(valid) or not valid[bowls].all():
+        raise InvalidDataError("Spieße enthalten Schüsseln, welche nicht existieren, Daten fehlerhaft")
+
+
+def pack_bowls(rows: numpy.ndarray, bowls: numpy.ndarray, shape: Tuple[int, int]) -> numpy.ndarray:
+    """setze für jedes Paar aus Zeile und Schüssel ein Bit, Bit n von Wort w steht für Schüssel 64 * w + n"""
+    words = numpy.zeros(shape, dtype=numpy.uint64)
+    numpy.bitwise_or.at(words, (rows, bowls >> 6), numpy.left_shift(numpy.uint64(1), (bowls & 63).astype(numpy.uint64)))
+    return words
+
+
+def fold_block(block: SkewerBlock) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """bilde für jede Frucht eines Blocks die Schnittmenge der Schüsseln ihrer Spieße"""
+    # gibt die Früchte, die Schüsseln aller Schnittmengen hintereinander und das Ende jeder Schnittmenge zurück
+    fruits, bowls, ends = block.fruits, block.bowls, block.ends
+    if len(bowls) and bowls.min() < 0:
+        raise ValueError("Spieße enthalten Schüsseln, welche nicht existieren")
+    if not len(fruits):
+        return fruits, bowls, numpy.zeros(0, dtype=numpy.int64)
+    skewers = block.skewers()
+    words = pack_bowls(skewers, bowls, (len(block), (block.columns() + 63) // 64))     # Schüsseln jedes Spießes als Bits
+    order = numpy.argsort(fruits)   # gruppiere die Vorkommen jeder Frucht, ihre Reihenfolge ist beliebig
+    sorted_fruits = fruits[order]
+    skewers = skewers[order]
+    starts = numpy.flatnonzero(numpy.concatenate(([True], sorted_fruits[1:] != sorted_fruits[:-1])))
+    occurrences = numpy.diff(starts, append=len(order))
+    # die Schnittmenge ist eine Teilmenge der Schüsseln des ersten Spießes, nur diese Paare werden weiter geprüft
+    lengths = numpy.diff(ends, prepend=0)
+    first_skewers = skewers[starts]
+    counts = lengths[first_skewers]
+    groups = numpy.repeat(numpy.arange(len(starts)), counts)    # Frucht jedes Paares
+    offsets = numpy.arange(len(groups)) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+    candidates = bowls[numpy.repeat(ends[first_skewers] - counts, counts) + offsets]
+    finished_groups, finished_candidates = [], []   # Paare von Früchten, deren Spieße alle geprüft wurden
+    for rank in range(1, int(occurrences.max()) + 1):   # die Paare werden meist nach wenigen Spießen seltener
+        live = occurrences[groups] > rank
+        finished_groups.append(groups[~live])
+        finished_candidates.append(candidates[~live])
+        groups = groups[live]
+        candidates = candidates[live]
+        skewer = skewers[starts[groups] + rank]
+        keep = (words[skewer, candidates >> 6] >> (candidates & 63).astype(numpy.uint64)) & numpy.uint64(1) != 0
+        groups = groups[keep]
+        candidates = candidates[keep]
+    groups = numpy.concatenate(finished_groups)
+    order = numpy.argsort(groups)
+    ends = numpy.cumsum(numpy.bincount(groups, minlength=len(starts)))
+    return sorted_fruits[starts], numpy.concatenate(finished_candidates)[order], ends
+
+
+def iter_folded(block: SkewerBlock) -> Iterator[Tuple[List[int], List[int]]]:
+    """gebe für jede Frucht eines Blocks einen Spieß mit der Schnittmenge ihrer Schüsseln zurück"""
+    # das Hinzufügen dieser Spieße verändert die Kandidaten genauso wie das Hinzufügen aller Spieße des Blocks
+    fruits, bowls, ends = fold_block(block)
+    bowls = bowls.tolist()
+    start = 0
+    for fruit, end in zip(fruits.tolist(), ends.tolist()):
+        yield [fruit], bowls[start:end]
+        start = end
+
+
 class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmengenoperation
     """Repräsentation der Kandidaten"""
     __slots__ = ("all_candidates",)
@@ -86,19 +425,28 @@ class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmen
 
     def add_skewer(self, fruits: Iterable[str], bowls: Iterable[int]) -> None:
         """füge die Daten eines Spießes hinzu"""
+        bowls = frozenset(bowls)
+        if not bowls <= self.all_candidates:    # alle Backends prüfen dies, bevor die Schüsseln verarbeitet werden
+            raise InvalidDataError("Spieße enthalten Schüsseln, welche nicht existieren, Daten fehlerhaft")
         for fruit in fruits:
             try:
                 current_candidates = self[fruit]
             except KeyError:
                 self[fruit] = set(bowls)    # füge im Falle von fehlenden Kandidaten die eigenen Schüsseln hinzu
             else:
-                current_candidates &= frozenset(bowls)  # entferne Kandidaten, die für den neuen Spieß nicht in frage kommen
+                current_candidates &= bowls     # entferne Kandidaten, die für den neuen Spieß nicht in frage kommen
 
     def add_skewers(self, skewers: Iterator[Tuple[Iterable[str], Iterable[int]]]) -> None:
         """füge die Daten mehrerer Spieße hinzu"""
         for fruits, bowls in skewers:
             self.add_skewer(fruits, bowls)
 
+    def add_skewer_blocks(self, blocks: Iterable[SkewerBlock]) -> None:
+        """füge die Spieße mehrerer Blöcke hinzu, die Schnittmengen innerhalb eines Blocks werden mit numpy gebildet"""
+        for block in blocks:
+            check_bowls(block.bowls, self.all_candidates)   # die Schnittmengen könnten fehlerhafte Schüsseln entfernen
+            self.add_skewers(iter_folded(block))
+
     def add_unknown_fruits(self, fruits: Iterable[str]) -> None:
         """füge eine Menge an Früchten hinzu, welche nicht in den Spießen vorkommen könnten"""
         # Kandidaten für alle Früchte welche nicht in Spießen vorkommen
@@ -112,8 +460,12 @@ class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmen
         possible = Candidates(self.all_candidates)      # Untermenge von self welche nur mögliche Kandidaten enthält (momentan 0)
         candidates = list(self.items())
         candidates.sort(key=lambda item: len(item[1]), reverse=True)    # sorge für eine möglicherweise kürzere Laufzeit
-        for combination in iter_possible(candidates, {}):   # befülle die möglichen Kandidaten
+        unconfirmed = {(fruit, bowl) for fruit, bowls in candidates for bowl in bowls}  # Paare, welche in noch keiner Zuordnung vorkamen
+        for combination in iter_witnesses(candidates, {}, unconfirmed):   # befülle die möglichen Kandidaten
+            if instrumentation.profiler is not None:
+                instrumentation.profiler.count("Zuordnungen")
             for bowl, fruit in combination.items():     # füge die zugeordnete Schüssel jeder Frucht deren möglichen Kandidaten hinzu
+                unconfirmed.discard((fruit, bowl))
                 try:
                     possible[fruit].add(bowl)
                 except KeyError:
@@ -125,15 +477,11 @@ class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmen
     def strip_impossible2(self) -> Candidates:
         """alternative Implementierung mit anderem Algorithmus"""
         possible = Candidates(self.all_candidates)      # Untermenge von self welche nur mögliche Kandidaten enthält (momentan 0)
-        graph = networkx.Graph()
-        graph.add_nodes_from(self.all_candidates, bipartite=1)  # füge alle Schüsseln als Knoten hinzu, sie bilden ein untereinander nicht verbundenes Set im Graphen
-        for fruit, candidates in self.items():
-            graph.add_node(fruit, bipartite=0)      # füge die Frucht als Knoten hinzu, die Früchte bilden das andere untereinander nicht verbundenene Set im Graphen
-            for bowl in candidates:
-                graph.add_edge(fruit, bowl)         # füge für jede Frucht Kanten zu ihren Kandidaten hinzu
-        for match in bipartitematching.enumMaximumMatching2(graph):     # befülle die möglichen Kandidaten
+        for match in bipartitematching.iterMaximumMatching3(self.to_graph()):     # befülle die möglichen Kandidaten, die Paarungen werden einzeln erzeugt
+            if instrumentation.profiler is not None:
+                instrumentation.profiler.count("Paarungen")
             matched_fruits = 0
-            for fruit, bowl in match:       # füge die zugeordnete Schüssel jeder Frucht deren möglichen Kandidaten hinzu
+            for (fruit,), bowl in match:       # füge die zugeordnete Schüssel jeder Frucht deren möglichen Kandidaten hinzu
                 try:
                     possible[fruit].add(bowl)
                 except KeyError:
@@ -143,6 +491,168 @@ class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmen
                 raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
         return possible
 
+    def to_graph(self) -> networkx.Graph:
+        """bilde den bipartiten Graphen aus Früchten und Schüsseln, die Früchte werden als Tupel dargestellt"""
+        graph = networkx.Graph()
+        graph.add_nodes_from(self.all_candidates, bipartite=1)  # füge alle Schüsseln als Knoten hinzu, sie bilden ein untereinander nicht verbundenes Set im Graphen
+        for fruit, candidates in self.items():
+            graph.add_node((fruit,), bipartite=0)   # füge die Frucht als Knoten hinzu, die Früchte bilden das andere untereinander nicht verbundenene Set im Graphen
+            for bowl in candidates:
+                graph.add_edge((fruit,), bowl)         # füge für jede Frucht Kanten zu ihren Kandidaten hinzu (Tupel, da Früchte auch Zahlen sein können)
+        return graph
+
+    def strip_impossible3(self) -> Candidates:
+        """alternative Implementierung mit polynomieller Laufzeit"""
+        assignment = matching.find_matching(self)   # eine Paarung mit möglichst vielen Früchten
+        if len(assignment) != len(self):    # es können nicht alle Früchte zugeordnet werden, Fehler
+            raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        possible = Candidates(self.all_candidates)
+        possible.update(matching.possible_pairs(self, assignment))  # Paare auf alternierenden Kreisen und Pfaden
+        if len(possible) == 0:  # es gibt keine mögliche Zuordnungen, Fehler
+            raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        return possible
+
+    def components(self) -> List[Candidates]:
+        """zerlege die Kandidaten in unabhängige Teile, deren Früchte keine gemeinsamen Kandidaten besitzen"""
+        parent: Dict[int, int] = {}     # Union-Find über die Schüsseln
+        for bowls in self.values():
+            bowls = iter(bowls)
+            first = next(bowls, None)
+            if first is None:
+                continue
+            root = find_root(parent, first)
+            for bowl in bowls:  # alle Kandidaten einer Frucht gehören zum selben Teil
+                other = find_root(parent, bowl)
+                if other != root:
+                    parent[other] = root
+        parts: Dict[int, Candidates] = {}
+        components = []
+        for fruit, bowls in self.items():
+            if bowls:
+                root = find_root(parent, next(iter(bowls)))
+                try:
+                    part = parts[root]
+                except KeyError:
+                    part = parts[root] = Candidates(set())
+                    components.append(part)
+            else:   # Früchte ohne Kandidaten bilden einen eigenen, unlösbaren Teil
+                part = Candidates(set())
+                components.append(part)
+            part[fruit] = bowls
+            part.all_candidates |= bowls
+        return components
+
+    def strip_impossible_components(self, method: str = "strip_impossible", processes: Optional[int] = None) -> Candidates:
+        """löse die unabhängigen Teile einzeln mit der angegebenen Methode und füge die Ergebnisse zusammen"""
+        # die Laufzeit ergibt sich so aus der Summe anstatt dem Produkt der Teile
+        components = self.components()
+        tasks = [(component, method) for component in components]
+        if processes is None or len(components) < 2:
+            results = map(solve_component, tasks)
+        else:   # verteile die Teile auf mehrere Prozesse, große Teile zuerst
+            import multiprocessing  # wird nur hier benötigt und verlängert sonst den Start
+            tasks.sort(key=lambda task: len(task[0]), reverse=True)
+            with multiprocessing.Pool(processes) as pool:
+                results = pool.map(solve_component, tasks, chunksize=1)
+        merged: Dict[str, Set[int]] = {}
+        for result in results:
+            merged.update(result)
+        if len(merged) != len(self):    # mindestens ein Teil besitzt keine Zuordnung, Fehler
+            raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        possible = Candidates(self.all_candidates)
+        for fruit in self:  # behalte die Reihenfolge der Früchte bei
+            possible[fruit] = merged[fruit]
+        return possible
+
+    def subtree(self, prefix: Mapping[str, int]) -> Candidates:
+        """gebe die Kandidaten der Früchte zurück, welche nach einer teilweisen Zuordnung noch zugeordnet werden müssen"""
+        taken = set(prefix.values())
+        residual = Candidates(self.all_candidates - taken)
+        for fruit, bowls in self.items():
+            if fruit not in prefix:
+                residual[fruit] = bowls - taken
+        return residual
+
+    def split_subtrees(self, tasks: int) -> List[Dict[str, int]]:
+        """zerlege den Suchbaum in mindestens 'tasks' Teilbäume, falls möglich, und gebe deren teilweise Zuordnungen zurück"""
+        # wie bei strip_impossible werden Früchte mit wenigen Kandidaten zuerst zugeordnet,
+        # teilweise Zuordnungen, welche sich nicht vervollständigen lassen, werden sofort verworfen
+        prefixes: List[Dict[str, int]] = [{}]
+        for fruit in sorted(self, key=lambda fruit: len(self[fruit])):
+            if len(prefixes) >= tasks:
+                break
+            expanded = []
+            for prefix in prefixes:
+                for bowl in self[fruit] - set(prefix.values()):
+                    extended = {**prefix, fruit: bowl}
+                    residual = self.subtree(extended)
+                    if len(matching.find_matching(residual)) == len(residual):
+                        expanded.append(extended)
+            prefixes = expanded
+        return prefixes
+
+    def strip_impossible_subtrees(self, method: str = "strip_impossible", processes: Optional[int] = None) -> Candidates:
+        """durchsuche die obersten Teilbäume des Suchbaums parallel mit der angegebenen Methode und füge die Ergebnisse zusammen"""
+        import multiprocessing  # wird nur hier benötigt und verlängert sonst den Start
+        import queue
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        prefixes = iter(self.split_subtrees(4 * processes))     # mehr Teilbäume als Prozesse gleichen unterschiedliche Laufzeiten aus
+        unconfirmed = {(fruit, bowl) for fruit, bowls in self.items() for bowl in bowls}    # Paare, welche in noch keiner Zuordnung vorkamen
+        merged: Dict[str, Set[int]] = {}
+        results: queue.Queue = queue.Queue()
+        with multiprocessing.Pool(processes) as pool:
+
+            def submit() -> bool:
+                """verteile den nächsten Teilbaum, welcher noch unbestätigte Paare enthält, an einen freien Prozess"""
+                for prefix in prefixes:
+                    residual = self.subtree(prefix)
+                    # überspringe Teilbäume, deren Paare bereits alle in anderen Teilbäumen bestätigt wurden
+                    if any(pair in unconfirmed for pair in prefix.items()) \
+                            or any((fruit, bowl) in unconfirmed for fruit, bowls in residual.items() for bowl in bowls):
+                        if instrumentation.profiler is not None:
+                            instrumentation.profiler.count("Teilbäume")
+                        pool.apply_async(solve_subtree, ((residual, prefix, method),), callback=results.put, error_callback=results.put)
+                        return True
+                return False
+
+            running = sum(submit() for _ in range(processes))
+            while running:  # jeder fertige Prozess erhält sofort den nächsten offenen Teilbaum
+                result = results.get()
+                running -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                if result is not None:
+                    for fruit, bowls in result.items():
+                        merged.setdefault(fruit, set()).update(bowls)
+                        unconfirmed.difference_update((fruit, bowl) for bowl in bowls)
+                running += submit()
+        if len(merged) == 0:    # es gibt keine mögliche Zuordnungen, Fehler
+            raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        possible = Candidates(self.all_candidates)
+        for fruit in self:  # behalte die Reihenfolge der Früchte bei
+            possible[fruit] = merged[fruit]
+        return possible
+
+    def count_assignments(self, cost_limit: int = 10 ** 6) -> counting.AssignmentCount:
+        """zähle die Zuordnungen aller Früchte zu Schüsseln, ohne diese aufzuzählen"""
+        # Teile, in denen alle Früchte dieselben Kandidaten besitzen, werden geschlossen gezählt,
+        # Teile mit höchstens 'cost_limit' Schritten exakt und für alle anderen wird eine obere Schranke berechnet
+        try:
+            possible = self.strip_impossible3()     # unmögliche Paare kommen in keiner Zuordnung vor, verkleinert die Teile
+        except InvalidDataError:
+            return counting.AssignmentCount.from_exact(0)
+        total = counting.AssignmentCount.from_exact(1)
+        for component in possible.components():
+            bowls = set(next(iter(component.values())))
+            if all(candidates == bowls for candidates in component.values()):
+                total *= counting.AssignmentCount.from_exact(counting.count_complete(len(component), len(bowls)))
+            elif counting.exact_cost(component, cost_limit) <= cost_limit:
+                total *= counting.AssignmentCount.from_exact(counting.count_exact(component))
+            else:
+                total *= counting.AssignmentCount.from_bound(counting.log10_upper_bound(component))
+        return total
+
     def bowls(self, wanted: Iterable[str]) -> Set[int]:
         """gebe die Schüsseln einer Menge von Früchten zurück"""
         solution = set()
@@ -151,6 +661,319 @@ class Candidates(Dict[str, Set[int]]):  # Set besitzt eine effiziente Schnittmen
         return solution
 
 
+class IncrementalCandidates(Candidates):
+    """Kandidaten, deren mögliche Kandidaten nach jedem Spieß aktualisiert werden"""
+    __slots__ = ("wanted", "unknown", "assignment", "possible")
+
+    wanted: List[str]
+
+    unknown: Set[str]
+
+    assignment: Dict[str, int]
+
+    possible: Optional[Candidates]
+
+    def __init__(self, all_candidates: Set[int], wanted: Iterable[str]) -> None:
+        super().__init__(all_candidates)
+        self.wanted = list(wanted)
+        self.unknown = set(self.wanted)     # Wunschsorten, welche noch in keinem Spieß vorkamen
+        self.assignment = {}
+        self.update()
+
+    def add_skewer(self, fruits: Iterable[str], bowls: Iterable[int]) -> None:
+        """füge die Daten eines Spießes hinzu und aktualisiere die möglichen Kandidaten"""
+        fruits = list(fruits)
+        for fruit in fruits:
+            if fruit in self.unknown:   # die Frucht ist nun bekannt, ihre Kandidaten ergeben sich aus den Spießen
+                self.unknown.discard(fruit)
+                del self[fruit]
+        super().add_skewer(fruits, bowls)
+        self.update()
+
+    def add_skewer_blocks(self, blocks: Iterable[SkewerBlock]) -> None:
+        """füge die Spieße mehrerer Blöcke einzeln hinzu, die Kandidaten werden nach jedem Spieß aktualisiert"""
+        self.add_skewers(chain.from_iterable(blocks))
+
+    def update(self) -> None:
+        """aktualisiere die Kandidaten der unbekannten Früchte, die Paarung und die möglichen Kandidaten"""
+        if self.unknown:
+            assigned = set(chain.from_iterable(bowls for fruit, bowls in self.items() if fruit not in self.unknown))
+            unknown_candidates = self.all_candidates - assigned
+            for fruit in self.unknown:
+                self[fruit] = unknown_candidates.copy()
+        # repariere die bisherige Paarung, anstatt sie neu zu berechnen
+        self.assignment = matching.find_matching(self, self.assignment)
+        if len(self.assignment) != len(self) or len(self) == 0:   # momentan keine Zuordnung möglich, weitere Spieße könnten dies ändern
+            self.possible = None
+        else:
+            self.possible = Candidates(self.all_candidates)
+            self.possible.update(matching.possible_pairs(self, self.assignment))
+
+    def determined(self) -> bool:
+        """prüfe, ob die Schüsseln der Wunschsorten eindeutig feststehen"""
+        return self.possible is not None and len(self.possible.bowls(self.wanted)) == len(self.wanted)
+
+    def strip_impossible(self) -> Candidates:
+        """gebe die bereits ermittelten möglichen Kandidaten zurück"""
+        if self.possible is None:
+            raise InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        return self.possible
+
+
+def bowls_to_mask(bowls: Iterable[int]) -> int:
+    """wandle eine Menge an Schüsseln in eine Bitmaske um, Bit n steht für Schüssel n"""
+    return reduce(or_, map((1).__lshift__, bowls), 0)
+
+
+def mask_to_bowls(mask: int) -> Set[int]:
+    """wandle eine Bitmaske in eine Menge an Schüsseln um"""
+    bowls = set()
+    while mask:
+        lowest = mask & -mask   # niedrigstes gesetztes Bit
+        bowls.add(lowest.bit_length() - 1)
+        mask ^= lowest
+    return bowls
+
+
+class BitCandidates(MutableMapping[str, Set[int]]):
+    """Repräsentation der Kandidaten als Bitmasken"""
+    # WARNUNG: die beim Zugriff zurückgegebenen Mengen sind Kopien, Änderungen an ihnen wirken sich nicht auf die Masken aus.
+    __slots__ = ("all_candidates", "all_mask", "masks")
+
+    all_candidates: Set[int]
+
+    all_mask: int
+
+    masks: Dict[str, int]
+
+    def __init__(self, all_candidates: Set[int]) -> None:
+        self.all_candidates = all_candidates
+        self.all_mask = bowls_to_mask(all_candidates)
+        self.masks = {}
+
+    def __getitem__(self, fruit: str) -> Set[int]:
+        return mask_to_bowls(self.masks[fruit])
+
+    def __setitem__(self, fruit: str, bowls: Iterable[int]) -> None:
+        self.masks[fruit] = bowls_to_mask(bowls)
+
+    def __delitem__(self, fruit: str) -> None:
+        del self.masks[fruit]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.masks)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def count(self, fruit: str) -> int:
+        """gebe die Anzahl der Kandidaten einer Frucht zurück"""
+        return self.masks[fruit].bit_count()
+
+    def add_skewer(self, fruits: Iterable[str], bowls: Iterable[int]) -> None:
+        """füge die Daten eines Spießes hinzu"""
+        try:
+            mask = bowls_to_mask(bowls)
+        except ValueError:  # negative Schüssel
+            mask = -1
+        if mask & ~self.all_mask:   # siehe Candidates.add_skewer
+            raise InvalidDataError("Spieße enthalten Schüsseln, welche nicht existieren, Daten fehlerhaft")
+        masks = self.masks
+        for fruit in fruits:
+            masks[fruit] = masks.get(fruit, mask) & mask    # Schnittmenge mit den bisherigen Kandidaten
+
+    add_skewers = Candidates.add_skewers
+
+    add_skewer_blocks = Candidates.add_skewer_blocks
+
+    def add_unknown_fruits(self, fruits: Iterable[str]) -> None:
+        """füge eine Menge an Früchten hinzu, welche nicht in den Spießen vorkommen könnten"""
+        unknown_mask = self.all_mask & ~reduce(or_, self.masks.values(), 0)    # alle Kandidaten - alle bereits vergebenen Kandidaten
+        for fruit in fruits:
+            self.masks.setdefault(fruit, unknown_mask)
+
+    def to_candidates(self) -> Candidates:
+        """wandle die Bitmasken in die Repräsentation mit Mengen um"""
+        candidates = Candidates(self.all_candidates)
+        for fruit, mask in self.masks.items():
+            candidates[fruit] = mask_to_bowls(mask)
+        return candidates
+
+    def strip_impossible(self) -> Candidates:
+        """siehe Candidates.strip_impossible"""
+        return self.to_candidates().strip_impossible()
+
+    def strip_impossible2(self) -> Candidates:
+        """siehe Candidates.strip_impossible2"""
+        return self.to_candidates().strip_impossible2()
+
+    def strip_impossible3(self) -> Candidates:
+        """siehe Candidates.strip_impossible3"""
+        return self.to_candidates().strip_impossible3()
+
+    def strip_impossible_components(self, method: str = "strip_impossible", processes: Optional[int] = None) -> Candidates:
+        """siehe Candidates.strip_impossible_components"""
+        return self.to_candidates().strip_impossible_components(method, processes)
+
+    def strip_impossible_subtrees(self, method: str = "strip_impossible", processes: Optional[int] = None) -> Candidates:
+        """siehe Candidates.strip_impossible_subtrees"""
+        return self.to_candidates().strip_impossible_subtrees(method, processes)
+
+    def count_assignments(self, cost_limit: int = 10 ** 6) -> counting.AssignmentCount:
+        """siehe Candidates.count_assignments"""
+        return self.to_candidates().count_assignments(cost_limit)
+
+    def bowls(self, wanted: Iterable[str]) -> Set[int]:
+        """gebe die Schüsseln einer Menge von Früchten zurück"""
+        masks = self.masks
+        return mask_to_bowls(reduce(or_, (masks[fruit] for fruit in wanted), 0))
+
+
+class NumpyCandidates(MutableMapping[str, Set[int]]):
+    """Repräsentation der Kandidaten als boolesche Matrix aus Früchten und Schüsseln, deren Zeilen als Bits gepackt sind"""
+    # WARNUNG: die beim Zugriff zurückgegebenen Mengen sind Kopien, Änderungen an ihnen wirken sich nicht auf die Matrix aus.
+    __slots__ = ("all_candidates", "columns", "all_mask", "rows", "size", "matrix", "chunk_size")
+
+    all_candidates: Set[int]
+
+    columns: int    # Anzahl der Spalten, Spalte n steht für Schüssel n
+
+    all_mask: numpy.ndarray     # gepackte Zeile mit allen Schüsseln
+
+    rows: Dict[str, int]    # Frucht -> Zeile der Matrix
+
+    size: int   # Anzahl der vergebenen Zeilen, auch von entfernten Früchten
+
+    matrix: numpy.ndarray   # gepackte Zeilen der Früchte (siehe pack_bowls), die Kapazität wird bei Bedarf verdoppelt
+
+    chunk_size: int     # Anzahl der Spieße, welche gemeinsam verarbeitet werden
+
+    def __init__(self, all_candidates: Set[int], chunk_size: int = 1 << 14) -> None:
+        self.all_candidates = all_candidates
+        self.columns = max(all_candidates, default=0) + 1
+        self.all_mask = self.pack(all_candidates)
+        self.rows = {}
+        self.size = 0
+        self.matrix = numpy.tile(self.all_mask, (16, 1))    # neue Früchte besitzen alle Schüsseln als Kandidaten
+        self.chunk_size = chunk_size
+
+    def check(self, bowls: numpy.ndarray) -> None:
+        """prüfe, ob alle Schüsseln existieren, da die Matrix nur deren Spalten besitzt (siehe Candidates.add_skewer)"""
+        check_bowls(bowls, self.all_candidates)
+
+    def pack(self, bowls: Iterable[int]) -> numpy.ndarray:
+        """wandle eine Menge an Schüsseln in eine gepackte Zeile um"""
+        bowls = numpy.fromiter(bowls, dtype=numpy.int64)
+        self.check(bowls)
+        return pack_bowls(numpy.zeros(len(bowls), dtype=numpy.int64), bowls, (1, (self.columns + 63) // 64))[0]
+
+    def unpack(self, row: numpy.ndarray) -> Set[int]:
+        """wandle eine gepackte Zeile in eine Menge an Schüsseln um"""
+        bits = numpy.unpackbits(row.astype("<u8").view(numpy.uint8), count=self.columns, bitorder="little")
+        return set(numpy.flatnonzero(bits).tolist())
+
+    def row(self, fruit: str) -> int:
+        """gebe die Zeile einer Frucht zurück, neue Früchte erhalten eine neue Zeile"""
+        try:
+            return self.rows[fruit]
+        except KeyError:
+            row = self.rows[fruit] = self.size
+            self.size += 1
+            if row == len(self.matrix):     # verdopple die Kapazität
+                self.matrix = numpy.concatenate((self.matrix, numpy.tile(self.all_mask, (len(self.matrix), 1))))
+            return row
+
+    def __getitem__(self, fruit: str) -> Set[int]:
+        return self.unpack(self.matrix[self.rows[fruit]])
+
+    def __setitem__(self, fruit: str, bowls: Iterable[int]) -> None:
+        self.matrix[self.row(fruit)] = self.pack(bowls) & self.all_mask
+
+    def __delitem__(self, fruit: str) -> None:
+        row = self.rows.pop(fruit)
+        self.matrix[row] = 0    # die Zeile bleibt ungenutzt
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add_skewer(self, fruits: Iterable[str], bowls: Iterable[int]) -> None:
+        """füge die Daten eines Spießes hinzu"""
+        self.add_skewers(iter([(fruits, bowls)]))
+
+    def add_skewers(self, skewers: Iterator[Tuple[Iterable[str], Iterable[int]]]) -> None:
+        """füge die Daten mehrerer Spieße hinzu, die Spieße werden blockweise als flache Felder verarbeitet"""
+        skewers = iter(skewers)
+        while True:
+            chunk = list(islice(skewers, self.chunk_size))
+            if not chunk:
+                return
+            fruits, bowls = zip(*chunk)
+            numbers: Dict[str, int] = defaultdict()     # Frucht -> Nummer innerhalb des Blocks
+            numbers.default_factory = numbers.__len__
+            block = SkewerBlock.from_skewers((map(numbers.__getitem__, names) for names in fruits), bowls)
+            self.fold(block, list(numbers))
+
+    def add_skewer_blocks(self, blocks: Iterable[SkewerBlock]) -> None:
+        """füge die Spieße mehrerer Blöcke hinzu, die Nummern der Früchte dienen als Namen"""
+        for block in blocks:
+            self.fold(block)
+
+    def fold(self, block: SkewerBlock, names: Optional[List[str]] = None) -> None:
+        """bilde die Schnittmenge der Kandidaten mit den Schüsseln eines Blocks von Spießen"""
+        # 'names' ordnet den Nummern der Früchte ihre Namen zu, ansonsten sind die Nummern selbst die Namen
+        self.check(block.bowls)
+        fruits, bowls, ends = fold_block(block)
+        fruits = fruits.tolist()
+        if names is not None:
+            fruits = list(map(names.__getitem__, fruits))
+        rows = numpy.fromiter(map(self.row, fruits), dtype=numpy.int64, count=len(fruits))   # kann die Matrix vergrößern
+        pairs = numpy.repeat(numpy.arange(len(rows)), numpy.diff(ends, prepend=0))     # Zeile jeder Schüssel in 'bowls'
+        self.matrix[rows] &= pack_bowls(pairs, bowls, (len(rows), self.matrix.shape[1]))
+
+    def add_unknown_fruits(self, fruits: Iterable[str]) -> None:
+        """füge eine Menge an Früchten hinzu, welche nicht in den Spießen vorkommen könnten"""
+        used = numpy.bitwise_or.reduce(self.matrix[:self.size], axis=0)     # alle bereits vergebenen Kandidaten
+        unknown_mask = self.all_mask & ~used
+        for fruit in fruits:
+            if fruit not in self.rows:
+                row = self.row(fruit)   # kann die Matrix vergrößern
+                self.matrix[row] = unknown_mask
+
+    def to_candidates(self) -> Candidates:
+        """wandle die Matrix in die Repräsentation mit Mengen um"""
+        candidates = Candidates(self.all_candidates)
+        for fruit, row in self.rows.items():
+            candidates[fruit] = self.unpack(self.matrix[row])
+        return candidates
+
+    strip_impossible = BitCandidates.strip_impossible
+
+    strip_impossible2 = BitCandidates.strip_impossible2
+
+    strip_impossible3 = BitCandidates.strip_impossible3
+
+    strip_impossible_components = BitCandidates.strip_impossible_components
+
+    strip_impossible_subtrees = BitCandidates.strip_impossible_subtrees
+
+    count_assignments = BitCandidates.count_assignments
+
+    def bowls(self, wanted: Iterable[str]) -> Set[int]:
+        """gebe die Schüsseln einer Menge von Früchten zurück"""
+        rows = [self.rows[fruit] for fruit in wanted]
+        return self.unpack(numpy.bitwise_or.reduce(self.matrix[rows], axis=0))
+
+
+BACKENDS = {
+    "set": Candidates,
+    "bitset": BitCandidates,
+    "numpy": NumpyCandidates
+}
+
+
 def parse_input(file: TextIO) -> Tuple[Set[int], List[str], Iterator[Tuple[List[str], List[int]]]]:
     """parse die bereitgestellte Datei und gebe alle Schüsseln, die Wunschsorten und alle Spieße mit Schüsseln zurück"""
     all_bowls = int(file.readline())    # Anzahl der Früchte
@@ -167,30 +990,191 @@ def parse_skewers(file: TextIO, skewers: int) -> Iterator[Tuple[List[str], List[
             raise ValueError(
                 f"Anzahl der Früchte und Schüsseln bei Spieß {skewer} stimmen nicht überein"
             )
+        if instrumentation.profiler is not None:
+            instrumentation.profiler.count("gelesene Spieße")
         yield fruits, [int(bowl) for bowl in bowls]
 
 
+class FruitNames:
+    """Tabelle, welche den Namen von Früchten fortlaufende Nummern zuweist"""
+    __slots__ = ("ids", "names")
+
+    ids: Dict[bytes, int]
+
+    names: List[str]
+
+    def __init__(self) -> None:
+        self.ids = defaultdict()
+        self.ids.default_factory = self.ids.__len__     # unbekannte Namen erhalten die nächste freie Nummer
+        self.names = []
+
+    def intern(self, names: Iterable[bytes]) -> List[int]:
+        """gebe die Nummern mehrerer Namen zurück"""
+        return list(map(self.ids.__getitem__, names))
+
+    def intern_array(self, names: List[bytes]) -> numpy.ndarray:
+        """wie intern, jedoch werden die Nummern als numpy Feld zurückgegeben"""
+        return numpy.fromiter(map(self.ids.__getitem__, names), dtype=numpy.int64, count=len(names))
+
+    def __getitem__(self, fruit: int) -> str:
+        """gebe den Namen einer Nummer zurück"""
+        if fruit >= len(self.names):    # ergänze die Umkehrtabelle um neue Namen, die Nummern entsprechen der Einfügereihenfolge
+            self.names.extend(name.decode() for name in islice(self.ids, len(self.names), None))
+        return self.names[fruit]
+
+
+def parse_input_bulk(file: BinaryIO, names: FruitNames, chunk_size: int = 1 << 22) -> Tuple[Set[int], List[int], Iterator[SkewerBlock]]:
+    """wie parse_input, jedoch werden die Früchte als Nummern aus 'names' dargestellt und die Spieße blockweise zurückgegeben"""
+    all_bowls = int(file.readline())    # Anzahl der Früchte
+    wanted = names.intern(file.readline().split())    # Wunschsorten
+    return set(range(1, all_bowls + 1)), wanted, parse_skewers_bulk(file, int(file.readline()), names, chunk_size)
+
+
+def iter_line_chunks(file: BinaryIO, chunk_size: int) -> Iterator[List[bytes]]:
+    """lese die bereitgestellte Datei blockweise und gebe die vollständigen Zeilen jedes Blocks zurück"""
+    rest = b""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            if rest:
+                yield [rest]
+            return
+        lines = (rest + chunk).split(b"\n")
+        rest = lines.pop()  # letzte Zeile ist möglicherweise unvollständig
+        yield lines
+
+
+def count_tokens(text: bytes) -> numpy.ndarray:
+    """zähle die durch Leerzeichen getrennten Wörter jeder Zeile eines Textes"""
+    buffer = numpy.frombuffer(text, dtype=numpy.uint8)
+    space = (buffer == 32) | ((buffer >= 9) & (buffer <= 13))   # Zeichen, an welchen bytes.split() trennt
+    starts = ~space     # Anfänge der Wörter
+    starts[1:] &= space[:-1]
+    bounds = numpy.searchsorted(numpy.flatnonzero(starts), numpy.flatnonzero(buffer == 10))    # Anzahl der Wörter vor jedem Zeilenumbruch
+    return numpy.diff(bounds, prepend=0, append=numpy.count_nonzero(starts))
+
+
+def parse_bowls(text: bytes, count: int) -> numpy.ndarray:
+    """wandle alle durch Leerzeichen getrennten Schüsseln eines Textes in Zahlen um"""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)     # wird von älteren Versionen bei fehlerhaften Daten ausgelöst
+            bowls = numpy.fromstring(text, dtype=numpy.int64, sep=" ")
+    except ValueError:
+        pass
+    else:
+        if len(bowls) == count:
+            return bowls
+    return numpy.array([int(bowl) for bowl in text.split()], dtype=numpy.int64)     # fehlerhafte Daten, löse den selben Fehler wie int() aus
+
+
+def parse_skewers_bulk(file: BinaryIO, skewers: int, names: FruitNames, chunk_size: int) -> Iterator[SkewerBlock]:
+    """wie parse_skewers, jedoch wird die Datei blockweise verarbeitet und jeder Block als flache Felder zurückgegeben"""
+    skewer = 0
+    pending: List[bytes] = []
+    # fehlende Zeilen werden wie bei readline() als leer behandelt
+    for lines in chain(iter_line_chunks(file, chunk_size), [[b""] * (2 * skewers)]):
+        pending.extend(lines)
+        usable = min(len(pending) // 2, skewers - skewer) * 2
+        if usable == 0:
+            if skewer == skewers:
+                return
+            continue
+        bowl_text = b"\n".join(pending[0:usable:2])    # Schüsseln der Spieße, durch Leerzeichen getrennt
+        fruit_text = b"\n".join(pending[1:usable:2])   # Früchte der Spieße, durch Leerzeichen getrennt
+        del pending[:usable]
+        bowl_counts = count_tokens(bowl_text)
+        fruit_counts = count_tokens(fruit_text)
+        if not numpy.array_equal(bowl_counts, fruit_counts):
+            offset = int(numpy.flatnonzero(bowl_counts != fruit_counts)[0])
+            raise ValueError(
+                f"Anzahl der Früchte und Schüsseln bei Spieß {skewer + offset} stimmen nicht überein"
+            )
+        ends = numpy.cumsum(bowl_counts)
+        # jeder Block wird als Ganzes in Zahlen umgewandelt
+        all_bowls = parse_bowls(bowl_text, int(ends[-1]))
+        all_fruits = names.intern_array(fruit_text.split())
+        if instrumentation.profiler is not None:
+            instrumentation.profiler.count("gelesene Spieße", len(ends))
+        yield SkewerBlock(all_fruits, all_bowls, ends)
+        skewer += len(ends)
+
+
 if __name__ == "__main__":
     args = argparser.parse_args()
-    all_bowls, wanted, skewers = parse_input(args.Datei)
-    candidates = Candidates(all_bowls)
-    candidates.add_skewers(skewers)
-    candidates.add_unknown_fruits(wanted)
-    if args.alternative:   # nicht unbedingt schneller, mehr in der Dokumentation
-        possible_candidates = candidates.strip_impossible2()
-    else:
+    if args.incremental and (args.engine is not None or args.alternative or args.matching or args.backend != "set"
+                             or args.components or args.subtrees):
+        # die möglichen Kandidaten werden nach jedem Spieß durch Reparieren der Paarung ermittelt
+        argparser.error("--incremental kann nicht mit --engine, --alternative, --matching, --backend, --components oder --subtrees kombiniert werden")
+    if args.profile is not None:
+        profiler = instrumentation.enable()
+    with instrumentation.phase("Einlesen"):     # die Spieße werden erst beim Hinzufügen gelesen
+        if args.fast:
+            fruit_names = FruitNames()
+            all_bowls, wanted, blocks = parse_input_bulk(args.Datei.buffer, fruit_names)
+            skewers = chain.from_iterable(blocks)   # einzelne Spieße, falls die Blöcke nicht direkt verarbeitet werden
+            name = fruit_names.__getitem__
+        else:
+            all_bowls, wanted, skewers = parse_input(args.Datei)
+            blocks = None
+            name = str
+    if args.incremental:
+        with instrumentation.phase("Spieße"):
+            candidates = IncrementalCandidates(all_bowls, wanted)
+            for number, (fruits, bowls) in enumerate(skewers, start=1):
+                candidates.add_skewer(fruits, bowls)
+                if candidates.determined():     # weitere Spieße werden nicht benötigt
+                    print(f"Schüsseln der Wunschsorten stehen nach Spieß {number} fest")
+                    break
         possible_candidates = candidates.strip_impossible()
+    else:
+        candidates = BACKENDS[args.backend](all_bowls)
+        with instrumentation.phase("Spieße"):
+            if blocks is None:
+                candidates.add_skewers(skewers)
+            else:
+                candidates.add_skewer_blocks(blocks)
+        with instrumentation.phase("unbekannte Früchte"):
+            candidates.add_unknown_fruits(wanted)
+        if args.engine is not None:
+            engine = args.engine
+        elif args.alternative:   # nicht unbedingt schneller, mehr in der Dokumentation
+            engine = "uno"
+        elif args.matching:
+            engine = "matching"
+        else:
+            engine = "backtracking"
+        if engine not in ENGINES:
+            argparser.error(f"unbekannter Algorithmus {engine}, verfügbar sind {', '.join(ENGINES)}")
+        with instrumentation.phase("Laden"):
+            method = ENGINES[engine].load()
+        with instrumentation.phase("Lösen"):
+            if args.components:
+                possible_candidates = candidates.strip_impossible_components(method, args.processes)
+            elif args.subtrees:
+                possible_candidates = candidates.strip_impossible_subtrees(method, args.processes)
+            else:
+                possible_candidates = getattr(candidates, method)()
     if args.debug:
         print("Kandidaten:")
         for fruit, bowls in candidates.items():
-            print(f"{fruit}: {bowls}")
+            print(f"{name(fruit)}: {bowls}")
         print("mögliche Kandidaten:")
         for fruit, bowls in possible_candidates.items():
-            print(f"{fruit}: {bowls}")
-    solution = possible_candidates.bowls(wanted)
+            print(f"{name(fruit)}: {bowls}")
+    if args.count:
+        with instrumentation.phase("Zählen"):
+            print("Anzahl der möglichen Zuordnungen:", possible_candidates.count_assignments())
+        print("Anzahl der möglichen Schüsseln der Wunschsorten:")
+        for fruit in wanted:
+            print(f"{name(fruit)}: {len(possible_candidates[fruit])}")
+    with instrumentation.phase("Schüsseln"):
+        solution = possible_candidates.bowls(wanted)
+    if args.profile is not None:
+        print(profiler.format(args.profile))
     if len(solution) != len(wanted):    # Lösung enthält unerwünschte Früchte
         raise MissingDataError(
-            f"es müssen mehr Schüsseln ({solution}) als gewünschte Früchte ({wanted}) besucht werden, "
+            f"es müssen mehr Schüsseln ({solution}) als gewünschte Früchte ({[name(fruit) for fruit in wanted]}) besucht werden, "
             "es fehlen weitere Daten"
         )
     print("Zu besuchende Schüsseln:", solution)
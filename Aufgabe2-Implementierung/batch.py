@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+
+"""Stapelverarbeitung vieler Dateien für Aufgabe2 des 39. BWINF"""
+
+import sys
+import os
+import json
+import argparse
+import multiprocessing
+from typing import Iterable, Iterator, List, Dict, Any, Optional
+import A2
+
+__version__ = "0.1"
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+
+argparser = argparse.ArgumentParser(
+    description=__doc__
+)
+argparser.add_argument(
+    "-v",
+    "--version",
+    help="zeige Versionsnummer",
+    action="version",
+    version=f"%(prog)s {__version__}"
+)
+argparser.add_argument(
+    "-a",
+    "--alternative",
+    help="benutze einen alternativen Algorithmus",
+    action="store_true"
+)
+argparser.add_argument(
+    "-m",
+    "--matching",
+    help="benutze einen Algorithmus mit polynomieller Laufzeit basierend auf einer maximalen Paarung",
+    action="store_true"
+)
+argparser.add_argument(
+    "-e",
+    "--engine",
+    help="Name des Algorithmus (backtracking, uno, matching), überschreibt --alternative und --matching",
+    default=None
+)
+argparser.add_argument(
+    "-b",
+    "--backend",
+    help="Speicherung der Kandidaten als Mengen, Bitmasken oder boolesche Matrix",
+    choices=("set", "bitset", "numpy"),
+    default="set"
+)
+argparser.add_argument(
+    "-f",
+    "--fast",
+    help="benutze einen schnelleren Parser, welcher die Dateien blockweise liest",
+    action="store_true"
+)
+argparser.add_argument(
+    "-p",
+    "--processes",
+    help="Anzahl der Prozesse, beim Fehlen wird die Anzahl der Prozessoren verwendet",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "Pfade",
+    help="Dateien oder Ordner, aus Ordnern werden alle .txt Dateien gelesen",
+    nargs="+"
+)
+
+options: Dict[str, Any] = {}    # Einstellungen der Prozesse, werden von init_worker gesetzt
+
+
+def init_worker(settings: Dict[str, Any]) -> None:
+    """initialisiere einen Prozess und lade die Abhängigkeiten des Algorithmus"""
+    options.update(settings)
+    A2.ENGINES[options.get("engine", "backtracking")].load()
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[str]:
+    """gebe alle Dateien der angegebenen Pfade zurück, Ordner werden nach .txt Dateien durchsucht"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".txt"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def solve(path: str) -> List[int]:
+    """löse eine Datei und gebe die zu besuchenden Schüsseln zurück"""
+    fast = options.get("fast")
+    with open(path, "rb" if fast else "r") as file:
+        if fast:
+            all_bowls, wanted, blocks = A2.parse_input_bulk(file, A2.FruitNames())
+            candidates = A2.BACKENDS[options.get("backend", "set")](all_bowls)
+            candidates.add_skewer_blocks(blocks)    # die Spieße werden beim Lesen verarbeitet
+        else:
+            all_bowls, wanted, skewers = A2.parse_input(file)
+            candidates = A2.BACKENDS[options.get("backend", "set")](all_bowls)
+            candidates.add_skewers(skewers)     # die Spieße werden beim Lesen verarbeitet
+    candidates.add_unknown_fruits(wanted)
+    method = A2.ENGINES[options.get("engine", "backtracking")].load()
+    possible_candidates = getattr(candidates, method)()
+    solution = possible_candidates.bowls(wanted)
+    if len(solution) != len(wanted):    # Lösung enthält unerwünschte Früchte
+        raise A2.MissingDataError(f"es müssen mehr Schüsseln ({solution}) als gewünschte Früchte besucht werden")
+    return sorted(solution)
+
+
+def solve_file(path: str) -> Dict[str, Any]:
+    """löse eine Datei und gebe das Ergebnis als Zeile für die Ausgabe zurück, Fehler werden nicht weitergegeben"""
+    try:
+        bowls = solve(path)
+    except Exception as error:  # ein Fehler soll nicht die restlichen Dateien abbrechen
+        return {"file": path, "bowls": None, "error": type(error).__name__, "message": str(error)}
+    return {"file": path, "bowls": bowls, "error": None, "message": None}
+
+
+def run(paths: Iterable[str], settings: Dict[str, Any], processes: Optional[int] = None, output=sys.stdout, progress=sys.stderr) -> int:
+    """löse alle Dateien auf mehreren Prozessen, gebe JSON Zeilen aus und gebe die Anzahl der Fehler zurück"""
+    files = list(iter_files(paths))
+    failed = 0
+    with multiprocessing.Pool(processes, initializer=init_worker, initargs=(settings,)) as pool:
+        # die Ergebnisse werden in der Reihenfolge ihrer Fertigstellung ausgegeben
+        for number, result in enumerate(pool.imap_unordered(solve_file, files), start=1):
+            print(json.dumps(result, ensure_ascii=False), file=output, flush=True)
+            if result["error"] is None:
+                print(f"[{number}/{len(files)}] {result['file']}: ok", file=progress)
+            else:
+                failed += 1
+                print(f"[{number}/{len(files)}] {result['file']}: {result['error']}: {result['message']}", file=progress)
+    return failed
+
+
+if __name__ == "__main__":
+    args = argparser.parse_args()
+    if args.engine is not None:
+        engine = args.engine
+    elif args.alternative:
+        engine = "uno"
+    elif args.matching:
+        engine = "matching"
+    else:
+        engine = "backtracking"
+    if engine not in A2.ENGINES:
+        argparser.error(f"unbekannter Algorithmus {engine}, verfügbar sind {', '.join(A2.ENGINES)}")
+    settings = {
+        "engine": engine,
+        "backend": args.backend,
+        "fast": args.fast
+    }
+    failed = run(args.Pfade, settings, args.processes)
+    if failed:
+        print(f"{failed} Dateien konnten nicht gelöst werden", file=sys.stderr)
+        sys.exit(1)
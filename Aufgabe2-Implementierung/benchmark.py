@@ -0,0 +1,367 @@
+#!/usr/bin/python3
+
+"""Vergleich der Laufzeit und des Speicherbedarfs der Algorithmen für Aufgabe2 des 39. BWINF"""
+
+import sys
+import os
+import csv
+import time
+import tempfile
+import subprocess
+import argparse
+import tracemalloc
+import multiprocessing
+from itertools import islice
+from typing import Callable, TextIO, Dict, List, Tuple, Optional
+import A2
+import bipartitematching
+import generator
+
+__version__ = "0.1"
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+
+argparser = argparse.ArgumentParser(
+    description=__doc__
+)
+argparser.add_argument(
+    "-v",
+    "--version",
+    help="zeige Versionsnummer",
+    action="version",
+    version=f"%(prog)s {__version__}"
+)
+argparser.add_argument(
+    "-n",
+    "--sizes",
+    help="durch Kommata getrennte Anzahlen an Schüsseln",
+    default="8,16,32,64,128"
+)
+argparser.add_argument(
+    "-e",
+    "--engines",
+    help="durch Kommata getrennte Algorithmen, beim Fehlen werden alle verglichen",
+    default=None
+)
+argparser.add_argument(
+    "-s",
+    "--skewers",
+    help="Anzahl der Spieße pro Schüssel",
+    type=float,
+    default=0.5
+)
+argparser.add_argument(
+    "-k",
+    "--size",
+    help="Anzahl der Früchte pro Spieß",
+    type=int,
+    default=4
+)
+argparser.add_argument(
+    "-a",
+    "--ambiguity",
+    help="Anteil der Früchte, welche sich nicht unterscheiden lassen",
+    type=float,
+    default=0.2
+)
+argparser.add_argument(
+    "-r",
+    "--seeds",
+    help="Anzahl der Eingaben pro Größe",
+    type=int,
+    default=1
+)
+argparser.add_argument(
+    "-l",
+    "--limit",
+    help="maximale Anzahl an aufgezählten Zuordnungen oder Paarungen pro Messung",
+    type=int,
+    default=1_000_000
+)
+argparser.add_argument(
+    "-t",
+    "--timeout",
+    help="maximale Laufzeit einer Messung in Sekunden, danach wird der Algorithmus für größere Eingaben übersprungen",
+    type=float,
+    default=60.0
+)
+argparser.add_argument(
+    "-c",
+    "--compare",
+    help="Pfad zu einem früheren Bericht, mit welchem die Laufzeiten verglichen werden",
+    type=argparse.FileType("r"),
+    default=None
+)
+argparser.add_argument(
+    "--tolerance",
+    help="Faktor, ab welchem eine längere Laufzeit als Verschlechterung gilt",
+    type=float,
+    default=1.5
+)
+argparser.add_argument(
+    "--startup",
+    help="miss stattdessen die Startzeit von A2.py für jeden Algorithmus mit der angegebenen Anzahl an Wiederholungen",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "Bericht",
+    type=argparse.FileType("w"),
+    help="Pfad zum Bericht im CSV Format, beim Fehlen wird auf Stdout geschrieben",
+    nargs="?",
+    default=sys.stdout
+)
+
+FIELDS = ("engine", "bowls", "skewers", "size", "ambiguity", "seed", "status", "seconds", "peak_bytes", "count")
+
+STARTUP_FIELDS = ("engine", "seconds", "modules")
+
+HEAVY_MODULES = ("numpy", "networkx", "scipy", "multiprocessing")     # Module, welche den Start merklich verlängern
+
+# führt A2.py aus und gibt danach die geladenen schweren Module auf Stderr aus
+STARTUP_PROBE = f"""
+import sys, runpy
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except BaseException:
+    pass
+print(",".join(module for module in {HEAVY_MODULES!r} if module in sys.modules), file=sys.stderr)
+"""
+
+
+class LimitExceeded(Exception):
+    """Fehler, welcher beim Überschreiten der maximalen Anzahl an Aufzählungen ausgelöst wird"""
+    __slots__ = ()
+
+
+def count_limited(items, limit: int) -> int:
+    """zähle die Elemente eines Iterators, brich beim Überschreiten von 'limit' ab"""
+    count = sum(1 for _ in islice(items, limit + 1))
+    if count > limit:
+        raise LimitExceeded(count)
+    return count
+
+
+def run_backtracking(candidates: A2.Candidates, limit: int) -> int:
+    """zähle alle Zuordnungen wie die ursprüngliche Implementierung von strip_impossible"""
+    items = list(candidates.items())
+    items.sort(key=lambda item: len(item[1]), reverse=True)
+    return count_limited(A2.iter_possible(items, {}), limit)
+
+
+def run_witnesses(candidates: A2.Candidates, limit: int) -> int:
+    """zähle die Zuordnungen, welche strip_impossible benötigt"""
+    items = list(candidates.items())
+    items.sort(key=lambda item: len(item[1]), reverse=True)
+    unconfirmed = {(fruit, bowl) for fruit, bowls in items for bowl in bowls}
+    count = 0
+    for combination in A2.iter_witnesses(items, {}, unconfirmed):
+        unconfirmed.difference_update((fruit, bowl) for bowl, fruit in combination.items())
+        count += 1
+        if count > limit:
+            raise LimitExceeded(count)
+    return count
+
+
+def run_uno(candidates: A2.Candidates, limit: int) -> int:
+    """zähle die maximalen Paarungen, welche strip_impossible2 erzeugt"""
+    return count_limited(bipartitematching.iterMaximumMatching3(candidates.to_graph()), limit)
+
+
+def run_uno_matrix(candidates: A2.Candidates, limit: int) -> int:
+    """zähle die maximalen Paarungen mit bipartitematching.iterMaximumMatching2, welches die Matrizen kopiert"""
+    return count_limited(bipartitematching.iterMaximumMatching2(candidates.to_graph()), limit)
+
+
+def run_uno_list(candidates: A2.Candidates, limit: int) -> int:
+    """zähle die maximalen Paarungen mit bipartitematching.enumMaximumMatching2, welche als Liste erzeugt werden"""
+    return len(bipartitematching.enumMaximumMatching2(candidates.to_graph()))
+
+
+def run_matching(candidates: A2.Candidates, limit: int) -> int:
+    """bestimme die möglichen Kandidaten mit strip_impossible3, welches genau eine Paarung benötigt"""
+    candidates.strip_impossible3()
+    return 1
+
+
+ENGINES: Dict[str, Callable[[A2.Candidates, int], int]] = {
+    "backtracking": run_backtracking,
+    "witnesses": run_witnesses,
+    "uno": run_uno,
+    "uno-matrix": run_uno_matrix,
+    "uno-list": run_uno_list,
+    "matching": run_matching
+}
+
+
+def build_candidates(bowls: int, skewers: int, size: int, ambiguity: float, seed: int) -> A2.Candidates:
+    """erzeuge eine zufällige Eingabe und deren Kandidaten"""
+    wanted, data = generator.generate(bowls, skewers, size, ambiguity, seed=seed)
+    candidates = A2.Candidates(set(range(1, bowls + 1)))
+    candidates.add_skewers(iter(data))
+    candidates.add_unknown_fruits(wanted)
+    return candidates
+
+
+def measure(engine: str, candidates: A2.Candidates, limit: int, connection) -> None:
+    """führe eine Messung aus und sende Status, Laufzeit, Speicherbedarf und Anzahl, wird in einem eigenen Prozess aufgerufen"""
+    function = ENGINES[engine]
+    try:
+        start = time.perf_counter()
+        count = function(candidates, limit)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()     # zweiter Durchlauf, da tracemalloc die Laufzeit verfälscht
+        function(candidates, limit)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    except LimitExceeded:
+        connection.send(("limit", time.perf_counter() - start, None, limit))
+    except Exception as error:  # z.B. Inkompatibilitäten mit neueren Versionen von networkx
+        connection.send((type(error).__name__, None, None, None))
+    else:
+        connection.send(("ok", seconds, peak, count))
+
+
+def run_isolated(engine: str, candidates: A2.Candidates, limit: int, timeout: float) -> Tuple[str, Optional[float], Optional[int], Optional[int]]:
+    """führe eine Messung in einem eigenen Prozess aus, damit sie nach 'timeout' Sekunden abgebrochen werden kann"""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=measure, args=(engine, candidates, limit, sender))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:    # der Prozess wurde beendet, z.B. wegen Speichermangel
+            result = ("crashed", None, None, None)
+    else:
+        process.terminate()
+        result = ("timeout", None, None, None)
+    process.join()
+    return result
+
+
+def sweep(sizes: List[int], engines: List[str], skewers: float, size: int, ambiguity: float, seeds: int, limit: int, timeout: float,
+          progress: TextIO = sys.stderr) -> List[Dict[str, str]]:
+    """vergleiche die Algorithmen auf Eingaben steigender Größe"""
+    rows = []
+    skipped = set()     # Algorithmen, welche bereits auf einer kleineren Eingabe abgebrochen wurden
+    for bowls in sizes:
+        skewer_count = max(1, round(bowls * skewers))
+        skewer_size = min(size, bowls)
+        for seed in range(seeds):
+            candidates = build_candidates(bowls, skewer_count, skewer_size, ambiguity, seed)
+            for engine in engines:
+                if engine in skipped:
+                    status, seconds, peak, count = "skipped", None, None, None
+                else:
+                    status, seconds, peak, count = run_isolated(engine, candidates, limit, timeout)
+                    if status in ("timeout", "limit", "crashed"):
+                        skipped.add(engine)
+                rows.append({
+                    "engine": engine,
+                    "bowls": str(bowls),
+                    "skewers": str(skewer_count),
+                    "size": str(skewer_size),
+                    "ambiguity": str(ambiguity),
+                    "seed": str(seed),
+                    "status": status,
+                    "seconds": "" if seconds is None else f"{seconds:.6f}",
+                    "peak_bytes": "" if peak is None else str(peak),
+                    "count": "" if count is None else str(count)
+                })
+                print(f"{engine:>12} n={bowls:<6} seed={seed:<3} {status:>8} {rows[-1]['seconds']:>12}s {rows[-1]['count']:>10}", file=progress)
+    return rows
+
+
+def measure_startup(engine: str, path: str, repeats: int) -> Tuple[float, List[str]]:
+    """miss die kürzeste Laufzeit von A2.py mit einem Algorithmus und gebe die dabei geladenen schweren Module zurück"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "A2.py")
+    best = float("inf")
+    modules: List[str] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE, script, "--engine", engine, path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        best = min(best, time.perf_counter() - start)
+        modules = [module for module in result.stderr.splitlines()[-1].split(",") if module]
+    return best, modules
+
+
+def startup(engines: List[str], repeats: int, progress: TextIO = sys.stderr) -> List[Dict[str, str]]:
+    """miss die Startzeit von A2.py für alle Algorithmen auf einer kleinen Eingabe"""
+    rows = []
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+        wanted, skewers = generator.generate(10, 4, 4, seed=0)
+        generator.write_input(file, 10, wanted, skewers)
+    try:
+        for engine in engines:
+            seconds, modules = measure_startup(engine, file.name, repeats)
+            rows.append({"engine": engine, "seconds": f"{seconds:.6f}", "modules": " ".join(modules)})
+            print(f"{engine:>12} {seconds:.3f}s {' '.join(modules) or '-'}", file=progress)
+    finally:
+        os.unlink(file.name)
+    return rows
+
+
+def crossovers(rows: List[Dict[str, str]]) -> Dict[str, str]:
+    """ermittle für jede Größe den schnellsten Algorithmus"""
+    best: Dict[str, Tuple[float, str]] = {}
+    for row in rows:
+        if row["status"] == "ok":
+            seconds = float(row["seconds"])
+            if row["bowls"] not in best or seconds < best[row["bowls"]][0]:
+                best[row["bowls"]] = (seconds, row["engine"])
+    return {bowls: engine for bowls, (_, engine) in best.items()}
+
+
+def regressions(rows: List[Dict[str, str]], old_rows: List[Dict[str, str]], tolerance: float) -> List[str]:
+    """vergleiche die Laufzeiten mit einem früheren Bericht und gebe alle Verschlechterungen zurück"""
+    key_fields = ("engine", "bowls", "skewers", "size", "ambiguity", "seed")
+    old = {tuple(row[field] for field in key_fields): row for row in old_rows}
+    found = []
+    for row in rows:
+        previous = old.get(tuple(row[field] for field in key_fields))
+        if previous is None:
+            continue
+        if previous["status"] == "ok" and row["status"] != "ok":
+            found.append(f"{row['engine']} n={row['bowls']} seed={row['seed']}: {row['status']} statt ok")
+        elif previous["status"] == "ok" and float(row["seconds"]) > tolerance * float(previous["seconds"]):
+            found.append(f"{row['engine']} n={row['bowls']} seed={row['seed']}: {previous['seconds']}s -> {row['seconds']}s")
+    return found
+
+
+if __name__ == "__main__":
+    args = argparser.parse_args()
+    engines = list(ENGINES) if args.engines is None else args.engines.split(",")
+    for engine in engines:
+        if engine not in ENGINES:
+            argparser.error(f"unbekannter Algorithmus {engine}, verfügbar sind {', '.join(ENGINES)}")
+    if args.startup is not None:    # der Standardalgorithmus soll keine schweren Module laden
+        rows = startup([engine for engine in A2.ENGINES], args.startup)
+        writer = csv.DictWriter(args.Bericht, STARTUP_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+        args.Bericht.flush()
+        if any(row["modules"] for row in rows if row["engine"] == "backtracking"):
+            print("der Standardalgorithmus lädt schwere Module", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    rows = sweep([int(size) for size in args.sizes.split(",")], engines, args.skewers, args.size, args.ambiguity, args.seeds, args.limit, args.timeout)
+    writer = csv.DictWriter(args.Bericht, FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+    args.Bericht.flush()
+    for bowls, engine in crossovers(rows).items():
+        print(f"schnellster Algorithmus für {bowls} Schüsseln: {engine}", file=sys.stderr)
+    if args.compare is not None:
+        found = regressions(rows, list(csv.DictReader(args.compare)), args.tolerance)
+        for regression in found:
+            print(f"Verschlechterung: {regression}", file=sys.stderr)
+        if found:
+            sys.exit(1)
@@ -14,10 +14,12 @@ Update time: 2017-06-29 14:41:56.
 
 
 #--------Import modules-------------------------
+import itertools
 import networkx as nx
 from networkx import bipartite
 import numpy
 from scipy import sparse
+import instrumentation
 
 
 
@@ -102,7 +104,7 @@ def enumMaximumMatching(g):
 
 
 
-def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
+def enumMaximumMatchingIter(g,match,all_matches,add_e=None,components=None,touched=()):
     '''Recurively search maximum matchings.
 
     <g>: undirected bipartite graph. Nodes are separated by their
@@ -113,6 +115,9 @@ def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
                    into this list.
     <add_e>: tuple, the edge used to form subproblems. If not None,
              will be added to each newly found matchings.
+    <components>, <touched>: strongly connected components of the parent
+                             problem and the nodes changed since, see
+                             findCycleSCC().
 
     Return <all_matches>: updated list of all maximum matchings.
 
@@ -123,10 +128,10 @@ def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
     #---------------Form directed graph D---------------
     d=formDirected(g,match)
 
-    #-----------------Find cycles in D-----------------
-    cycles=list(nx.simple_cycles(d))
+    #-----------------Find a cycle in D-----------------
+    cycle,components=findCycleSCC(d.successors,d.nodes,components,touched)
 
-    if len(cycles)==0:
+    if cycle is None:
 
         #---------If no cycle, find a feasible path---------
         all_uncovered=set(g.nodes).difference(set([ii[0] for ii in match]))
@@ -168,7 +173,7 @@ def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
         len2path=len2paths[0]
         if reversed:
             len2path=len2path[::-1]
-        len2path=zip(len2path[:-1],len2path[1:])
+        len2path=list(zip(len2path[:-1],len2path[1:]))
 
         new_match=[]
         for ee in d.edges():
@@ -201,15 +206,13 @@ def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
         if add_e is not None:
             add_e_new.extend(add_e)
 
-        all_matches=enumMaximumMatchingIter(g_minus,match,all_matches,add_e)
-        all_matches=enumMaximumMatchingIter(g_plus,new_match,all_matches,add_e_new)
+        all_matches=enumMaximumMatchingIter(g_minus,match,all_matches,add_e,components,e)
+        all_matches=enumMaximumMatchingIter(g_plus,new_match,all_matches,add_e_new,components,e)
 
 
     else:
-        #----------------Find a cycle in D----------------
-        cycle=cycles[0]
         cycle.append(cycle[0])
-        cycle=zip(cycle[:-1],cycle[1:])
+        cycle=list(zip(cycle[:-1],cycle[1:]))
 
         #-------------Create a new matching M'-------------
         new_match=[]
@@ -242,8 +245,8 @@ def enumMaximumMatchingIter(g,match,all_matches,add_e=None):
         if add_e is not None:
             add_e_new.extend(add_e)
 
-        all_matches=enumMaximumMatchingIter(g_minus,new_match,all_matches,add_e)
-        all_matches=enumMaximumMatchingIter(g_plus,match,all_matches,add_e_new)
+        all_matches=enumMaximumMatchingIter(g_minus,new_match,all_matches,add_e,components,e)
+        all_matches=enumMaximumMatchingIter(g_plus,match,all_matches,add_e_new,components,e)
 
     return all_matches
     
@@ -290,26 +293,22 @@ def enumMaximumMatching2(g):
 
 
 
-def enumMaximumMatchingIter2(adj,matchadj,all_matches,n1,add_e=None,check_cycle=True):
+def enumMaximumMatchingIter2(adj,matchadj,all_matches,n1,add_e=None,check_cycle=True,components=None,touched=()):
     '''Similar to enumMaximumMatching() but implemented using adjacency matrix
     of graph. Slight speed boost.
     '''
 
     #-------------------Find cycles-------------------
     if check_cycle:
-        d=matchadj.multiply(adj)
+        d=sparse.lil_matrix(matchadj.multiply(adj))
         d[n1:,:]=adj[n1:,:]-matchadj[n1:,:].multiply(adj[n1:,:])
 
-        dg=nx.from_numpy_matrix(d.toarray(),create_using=nx.DiGraph())
-        cycles=list(nx.simple_cycles(dg))
-        if len(cycles)==0:
-            check_cycle=False
-        else:
-            check_cycle=True
+        dg=nx.from_numpy_array(d.toarray(),create_using=nx.DiGraph())
+        cycle,components=findCycleSCC(dg.successors,dg.nodes,components,touched)
+        check_cycle=cycle is not None
 
     #if len(cycles)>0:
     if check_cycle:
-        cycle=cycles[0]
         cycle.append(cycle[0])
         cycle=zip(cycle[:-1],cycle[1:])
 
@@ -345,8 +344,8 @@ def enumMaximumMatchingIter2(adj,matchadj,all_matches,n1,add_e=None,check_cycle=
         if add_e is not None:
             add_e_new.extend(add_e)
 
-        all_matches=enumMaximumMatchingIter2(g_minus,new_match,all_matches,n1,add_e,check_cycle)
-        all_matches=enumMaximumMatchingIter2(g_plus,matchadj,all_matches,n1,add_e_new,check_cycle)
+        all_matches=enumMaximumMatchingIter2(g_minus,new_match,all_matches,n1,add_e,check_cycle,components,e)
+        all_matches=enumMaximumMatchingIter2(g_plus,matchadj,all_matches,n1,add_e_new,check_cycle,components,e)
 
     else:
         #---------------Find uncovered nodes---------------
@@ -370,7 +369,7 @@ def enumMaximumMatchingIter2(adj,matchadj,all_matches,n1,add_e=None,check_cycle=
 
         #----------------------Find e----------------------
         feas1,feas2=paths[0]
-        e=(feas1,int(sparse.find(matchadj[:,feas2]==1)[0]))
+        e=(feas1,int(sparse.find(matchadj[:,feas2]==1)[0][0]))
 
         #----------------Create a new match----------------
         new_match=matchadj.copy()
@@ -407,6 +406,451 @@ def enumMaximumMatchingIter2(adj,matchadj,all_matches,n1,add_e=None,check_cycle=
 
 
 
+def iterMaximumMatching2(g):
+    '''Similar to enumMaximumMatching2() but a generator, yielding every
+    maximum matching as soon as it is found.
+
+    <g>: undirected bipartite graph. Nodes are separated by their
+         'bipartite' attribute.
+
+    Yield <match_list>: list of (node1, node2) tuples forming a maximum
+                        matching of <g>, node1 is from set-0 (bipartite
+                        attribute ==0). Matchings are not collected, so
+                        memory does not grow with their number.
+    '''
+
+    s1=set(n for n,d in g.nodes(data=True) if d['bipartite']==0)
+    s2=set(g)-s1
+    n1=len(s1)
+    nodes=list(s1)+list(s2)
+    index=dict(zip(nodes,range(len(nodes))))
+
+    adj=sparse.lil_matrix(nx.adjacency_matrix(g,nodes))
+
+    #----------------Find one matching----------------
+    match=bipartite.hopcroft_karp_matching(g, s1)
+
+    matchadj=sparse.lil_matrix(adj.shape,dtype='int')
+    for kk,vv in match.items():
+        matchadj[index[kk],index[vv]]=1
+
+    #-----------------Enter recursion-----------------
+    matches=iterMaximumMatchingIter2(adj,matchadj,n1,None,True)
+    for ii in itertools.chain([matchadj],matches):
+
+        #---------------Re-orient match arcs---------------
+        match_list=sparse.find(ii[:n1]==1)
+        yield [(nodes[jj],nodes[kk]) for jj,kk in zip(match_list[0],match_list[1])]
+
+
+
+def iterMaximumMatchingIter2(adj,matchadj,n1,add_e=None,check_cycle=True,components=None,touched=(),depth=0):
+    '''Similar to enumMaximumMatchingIter2() but a generator, yielding each
+    newly found matching as adjacency matrix instead of collecting them.
+
+    <depth>: int, recursion depth, reported to the profiler if enabled.
+    '''
+
+    if instrumentation.profiler is not None:
+        instrumentation.profiler.node('Knoten (iterMaximumMatchingIter2)',depth)
+
+    #-------------------Find cycles-------------------
+    if check_cycle:
+        d=sparse.lil_matrix(matchadj.multiply(adj))
+        d[n1:,:]=adj[n1:,:]-matchadj[n1:,:].multiply(adj[n1:,:])
+
+        dg=nx.from_numpy_array(d.toarray(),create_using=nx.DiGraph())
+        cycle,components=findCycleSCC(dg.successors,dg.nodes,components,touched)
+        check_cycle=cycle is not None
+
+    if check_cycle:
+        cycle.append(cycle[0])
+        cycle=zip(cycle[:-1],cycle[1:])
+
+        #--------------Create a new matching--------------
+        new_match=matchadj.copy()
+        for ee in cycle:
+            if matchadj[ee[0],ee[1]]==1:
+                new_match[ee[0],ee[1]]=0
+                new_match[ee[1],ee[0]]=0
+                e=ee
+            else:
+                new_match[ee[0],ee[1]]=1
+                new_match[ee[1],ee[0]]=1
+
+        if add_e is not None:
+            for ii in add_e:
+                new_match[ii[0],ii[1]]=1
+
+        yield new_match
+
+        #-----------------Form subproblems-----------------
+        g_plus=adj.copy()
+        g_minus=adj.copy()
+        g_plus[e[0],:]=0
+        g_plus[:,e[1]]=0
+        g_plus[:,e[0]]=0
+        g_plus[e[1],:]=0
+        g_minus[e[0],e[1]]=0
+        g_minus[e[1],e[0]]=0
+
+        add_e_new=[e,]
+        if add_e is not None:
+            add_e_new.extend(add_e)
+
+        yield from iterMaximumMatchingIter2(g_minus,new_match,n1,add_e,check_cycle,components,e,depth+1)
+        yield from iterMaximumMatchingIter2(g_plus,matchadj,n1,add_e_new,check_cycle,components,e,depth+1)
+
+    else:
+        #---------------Find uncovered nodes---------------
+        uncovered=numpy.where(numpy.asarray(matchadj.sum(axis=1)).ravel()==0)[0]
+
+        if len(uncovered)==0:
+            return
+
+        #---------------Find feasible paths---------------
+        paths=[]
+        for ii in uncovered:
+            aa=adj[ii,:].dot(matchadj)
+            if aa.sum()==0:
+                continue
+            paths.append((ii,int(sparse.find(aa==1)[1][0])))
+            if len(paths)>0:
+                break
+
+        if len(paths)==0:
+            return
+
+        #----------------------Find e----------------------
+        feas1,feas2=paths[0]
+        e=(feas1,int(sparse.find(matchadj[:,feas2]==1)[0][0]))
+
+        #----------------Create a new match----------------
+        new_match=matchadj.copy()
+        new_match[feas2,:]=0
+        new_match[:,feas2]=0
+        new_match[feas1,e[1]]=1
+        new_match[e[1],feas1]=1
+
+        if add_e is not None:
+            for ii in add_e:
+                new_match[ii[0],ii[1]]=1
+
+        yield new_match
+
+        #-----------------Form subproblems-----------------
+        g_plus=adj.copy()
+        g_minus=adj.copy()
+        g_plus[e[0],:]=0
+        g_plus[:,e[1]]=0
+        g_plus[:,e[0]]=0
+        g_plus[e[1],:]=0
+        g_minus[e[0],e[1]]=0
+        g_minus[e[1],e[0]]=0
+
+        add_e_new=[e,]
+        if add_e is not None:
+            add_e_new.extend(add_e)
+
+        yield from iterMaximumMatchingIter2(g_minus,matchadj,n1,add_e,check_cycle,depth=depth+1)
+        yield from iterMaximumMatchingIter2(g_plus,new_match,n1,add_e_new,check_cycle,depth=depth+1)
+
+
+def iterMaximumMatching3(g):
+    '''Similar to iterMaximumMatching2() but using compact adjacency lists
+    which are modified in place instead of copied matrices.
+
+    <g>: undirected bipartite graph. Nodes are separated by their
+         'bipartite' attribute.
+
+    Yield <match_list>: list of (node1, node2) tuples forming a maximum
+                        matching of <g>, node1 is from set-0 (bipartite
+                        attribute ==0).
+
+    Every search node costs O(V+E): edges and vertices are removed in
+    place and restored from an undo log when the search backtracks.
+    '''
+
+    s1=[n for n,d in g.nodes(data=True) if d['bipartite']==0]
+    s2=[n for n in g if g.nodes[n]['bipartite']!=0]
+    n1=len(s1)
+    nodes=s1+s2
+    index=dict(zip(nodes,range(len(nodes))))
+
+    adj=[set() for ii in nodes]
+    for aa,bb in g.edges():
+        adj[index[aa]].add(index[bb])
+        adj[index[bb]].add(index[aa])
+
+    #----------------Find one matching----------------
+    match=bipartite.hopcroft_karp_matching(g, set(s1))
+
+    mate=[-1]*len(nodes)
+    for kk,vv in match.items():
+        mate[index[kk]]=index[vv]
+
+    #-----------------Enter recursion-----------------
+    for ii in itertools.chain([mate],iterMaximumMatchingIter3(adj,mate,n1)):
+
+        #---------------Re-orient match arcs---------------
+        yield [(nodes[jj],nodes[ii[jj]]) for jj in range(n1) if ii[jj]!=-1]
+
+
+
+def successors3(adj,mate,n1):
+    '''Return the successor function of the directed graph D formed by a
+    matching.
+
+    <adj>: list of sets, neighbours of every node, set-0 nodes come first.
+    <mate>: list, matched partner of every node or -1.
+    <n1>: int, number of set-0 nodes.
+
+    Matched edges point from set-0 to set-1, the other edges from set-1
+    to set-0. The function reads <adj> and <mate> on every call.
+    '''
+
+    def succ(v):
+        if v<n1:
+            if mate[v]!=-1 and mate[v] in adj[v]:
+                return (mate[v],)
+            return ()
+        return [u for u in adj[v] if u!=mate[v]]
+
+    return succ
+
+
+
+def iterMaximumMatchingIter3(adj,mate,n1,check_cycle=True):
+    '''Similar to iterMaximumMatchingIter2() but working on adjacency sets
+    and a mate list, both modified in place.
+
+    <adj>: list of sets, neighbours of every node, set-0 nodes come first.
+    <mate>: list, matched partner of every node or -1.
+    <n1>: int, number of set-0 nodes.
+
+    Yield <mate>: the mate list of each newly found matching. It is changed
+                  when the generator is resumed, so copy it if needed.
+
+    The recursion of iterMaximumMatchingIter2() is replaced by a task
+    stack. g_minus and g_plus are formed by removing edges from <adj>,
+    all changes to <adj> and <mate> are recorded in an undo log and
+    reverted after each subproblem. <adj> and <mate> are restored when
+    the generator is exhausted. Cycles are found with findCycleSCC(), the
+    components are passed on to the subproblems. Every task carries the
+    depth its recursive call would have, it is reported to the profiler
+    if enabled.
+    '''
+
+    log=[]
+    succ=successors3(adj,mate,n1)
+
+    def removeEdge(aa,bb):
+        adj[aa].discard(bb)
+        adj[bb].discard(aa)
+        log.append((0,aa,bb))
+
+    def setMate(aa,bb):
+        log.append((1,aa,mate[aa]))
+        mate[aa]=bb
+
+    def rollback(mark):
+        while len(log)>mark:
+            kind,aa,bb=log.pop()
+            if kind==0:
+                adj[aa].add(bb)
+                adj[bb].add(aa)
+            else:
+                mate[aa]=bb
+
+    tasks=[('enter',check_cycle,0)]
+    while tasks:
+        task=tasks.pop()
+        if task[0]=='rollback':
+            rollback(task[1])
+            continue
+        if task[0]=='minus':
+            _,e,changes,check_cycle,components,depth=task
+            touched=e
+            removeEdge(*e)
+        elif task[0]=='plus':
+            _,e,changes,check_cycle,components,depth=task
+            touched=e
+            for ii in e:
+                for jj in list(adj[ii]):
+                    removeEdge(ii,jj)
+        else:
+            _,check_cycle,depth=task
+            changes,components,touched=None,None,()
+        if instrumentation.profiler is not None:
+            instrumentation.profiler.node('Knoten (iterMaximumMatchingIter3)',depth)
+        if changes is not None:
+            for aa,bb in changes:
+                setMate(aa,bb)
+
+        #-------------------Find cycles-------------------
+        cycle=None
+        if check_cycle:
+            cycle,components=findCycleSCC(succ,range(len(adj)),components,touched)
+            check_cycle=cycle is not None
+
+        if check_cycle:
+            #--------------Create a new matching--------------
+            # every set-0 node is matched to the set-1 node before it
+            changes=[]
+            e=None
+            for pos,vv in enumerate(cycle):
+                if vv<n1:
+                    if e is None:
+                        e=(vv,mate[vv])
+                    prev=cycle[pos-1]
+                    changes.append((vv,prev))
+                    changes.append((prev,vv))
+            minus_changes,plus_changes=changes,None
+        else:
+            #---------------Find feasible paths---------------
+            e=None
+            for ii in range(len(adj)):
+                if mate[ii]!=-1:
+                    continue
+                for ww in adj[ii]:
+                    if mate[ww]!=-1:
+                        e=(ii,ww)
+                        break
+                if e is not None:
+                    break
+
+            if e is None:
+                continue
+
+            #----------------Create a new match----------------
+            feas2=mate[e[1]]
+            changes=[(feas2,-1),(e[0],e[1]),(e[1],e[0])]
+            minus_changes,plus_changes=None,changes
+
+        mark=len(log)
+        for aa,bb in changes:
+            setMate(aa,bb)
+        yield mate
+        rollback(mark)
+
+        #-----------------Form subproblems-----------------
+        tasks.append(('rollback',mark))
+        tasks.append(('plus',e,plus_changes,check_cycle,components,depth+1))
+        tasks.append(('rollback',mark))
+        tasks.append(('minus',e,minus_changes,check_cycle,components,depth+1))
+
+
+
+def strongComponents(succ,nodes):
+    '''Find the strongly connected components with more than one node.
+
+    <succ>: function, returning the successors of a node.
+    <nodes>: set of nodes, successors outside of it are ignored.
+
+    Return <components>: list of sets of nodes. Iterative Tarjan in O(V+E).
+    '''
+
+    components=[]
+    index={}
+    lowlink={}
+    stack=[]
+    on_stack=set()
+    for root in nodes:
+        if root in index:
+            continue
+        index[root]=lowlink[root]=len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work=[(root,iter(succ(root)))]
+        while work:
+            v,neighbours=work[-1]
+            for nn in neighbours:
+                if nn not in nodes:
+                    continue
+                if nn not in index:
+                    index[nn]=lowlink[nn]=len(index)
+                    stack.append(nn)
+                    on_stack.add(nn)
+                    work.append((nn,iter(succ(nn))))
+                    break
+                elif nn in on_stack:
+                    lowlink[v]=min(lowlink[v],index[nn])
+            else:
+                work.pop()
+                if work:
+                    parent=work[-1][0]
+                    lowlink[parent]=min(lowlink[parent],lowlink[v])
+                if lowlink[v]==index[v]:
+                    component=set()
+                    while True:
+                        member=stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member==v:
+                            break
+                    if len(component)>1:
+                        components.append(component)
+    return components
+
+
+
+def findCycleSCC(succ,nodes,components=None,touched=()):
+    '''Find one cycle in a directed graph using its strongly connected
+    components, instead of listing all simple cycles.
+
+    <succ>: function, returning the successors of a node.
+    <nodes>: iterable of all nodes of the graph.
+    <components>: list of sets, the components returned for the parent
+                  problem, or None to compute them from scratch.
+    <touched>: nodes whose edges or matching changed since <components>
+               were computed.
+
+    Return <cycle>: list of nodes forming a cycle, or None if acyclic.
+           <components>: list of sets, components with more than one
+                         node, to be passed to the subproblems.
+
+    Removing edges or nodes only splits components, and flipping a cycle
+    within a component keeps it strongly connected. Therefore only the
+    components containing <touched> nodes are recomputed.
+    '''
+
+    if components is None:
+        components=strongComponents(succ,set(nodes))
+    else:
+        nodes=set(nodes)
+        new_components=[]
+        for cc in components:
+            if cc.isdisjoint(touched):
+                new_components.append(cc)
+            else:
+                new_components.extend(strongComponents(succ,cc.intersection(nodes)))
+        components=new_components
+
+    if len(components)==0:
+        return None,components
+
+    #----------Search back to the start node----------
+    cc=components[0]
+    start=next(iter(cc))
+    parent={start:None}
+    queue=[start]
+    for vv in queue:
+        for nn in succ(vv):
+            if nn==start:
+                cycle=[vv]
+                while parent[cycle[-1]] is not None:
+                    cycle.append(parent[cycle[-1]])
+                return cycle[::-1],components
+            if nn in cc and nn not in parent:
+                parent[nn]=vv
+                queue.append(nn)
+
+    return None,components
+
+
+
+
+
 def findCycle(adj,n1):
     path=[]
     visited=set()
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+"""Zählen der Zuordnungen von Früchten zu Schüsseln ohne diese aufzuzählen"""
+
+from math import comb, floor, lgamma, log, log10, perm
+from typing import Iterable, Mapping, Dict, Hashable, TypeVar
+
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+K = TypeVar("K", bound=Hashable)
+
+MAX_DIGITS = 50     # exakte Anzahlen mit mehr Stellen werden in wissenschaftlicher Schreibweise ausgegeben
+
+
+def count_exact(adjacency: Mapping[K, Iterable[int]]) -> int:
+    """zähle alle Zuordnungen, welche jeder Frucht eine eigene Schüssel zuweisen (Permanente mit Bitmasken)"""
+    # die Laufzeit wächst mit 2 ^ Anzahl der Früchte, die Anzahl der Schüsseln geht nur linear ein (siehe exact_cost)
+    fruits = {fruit: number for number, fruit in enumerate(adjacency)}
+    owners: Dict[int, int] = {}     # Schüssel -> Bitmaske der Früchte, welche sie als Kandidat besitzen
+    for fruit, bowls in adjacency.items():
+        for bowl in bowls:
+            owners[bowl] = owners.get(bowl, 0) | 1 << fruits[fruit]
+    counts = {0: 1}     # Bitmaske der bereits zugeordneten Früchte -> Anzahl der Zuordnungen
+    for mask in owners.values():    # jede Schüssel bleibt leer oder erhält eine ihrer Früchte
+        new_counts = counts.copy()
+        for assigned, count in counts.items():
+            free = mask & ~assigned
+            while free:
+                lowest = free & -free
+                key = assigned | lowest
+                new_counts[key] = new_counts.get(key, 0) + count
+                free ^= lowest
+        counts = new_counts
+    return counts.get((1 << len(fruits)) - 1, 0)
+
+
+def exact_cost(adjacency: Mapping[K, Iterable[int]], limit: int) -> int:
+    """schätze die Anzahl der Schritte von count_exact nach oben ab (Schüsseln * erreichbare Zustände)"""
+    # nach der j-ten Schüssel sind nur Teilmengen der bisher erreichten Früchte mit höchstens j Elementen erreichbar,
+    # die Berechnung bricht ab, sobald 'limit' überschritten ist
+    fruits = {fruit: number for number, fruit in enumerate(adjacency)}
+    owners: Dict[int, int] = {}
+    for fruit, bowls in adjacency.items():
+        for bowl in bowls:
+            owners[bowl] = owners.get(bowl, 0) | 1 << fruits[fruit]
+    cost = 0
+    reached = 0
+    for number, mask in enumerate(owners.values(), 1):
+        reached |= mask
+        size = reached.bit_count()
+        cost += sum(comb(size, chosen) for chosen in range(min(number, size) + 1))
+        if cost > limit:
+            break
+    return cost
+
+
+def count_complete(fruits: int, bowls: int) -> int:
+    """zähle die Zuordnungen, wenn jede Frucht jede Schüssel als Kandidat besitzt (bowls! / (bowls - fruits)!)"""
+    return perm(bowls, fruits)     # 0, falls es mehr Früchte als Schüsseln gibt
+
+
+def log10_upper_bound(adjacency: Mapping[K, Iterable[int]]) -> float:
+    """schätze den Logarithmus der Anzahl der Zuordnungen nach oben ab (Bregman-Minc)"""
+    degrees = [len(set(bowls)) for bowls in adjacency.values()]
+    if not degrees:
+        return 0.0
+    if 0 in degrees:
+        return float("-inf")
+    fruits = len(degrees)
+    bowls = len(set().union(*map(set, adjacency.values())))
+    # triviale Schranke: jede Frucht wählt unabhängig einen ihrer Kandidaten
+    product = sum(map(log, degrees))
+    # Bregman-Minc für die um Zeilen aus Einsen zu einer quadratischen Matrix ergänzte Kandidatenmatrix,
+    # jede Zuordnung entspricht dabei (Schüsseln - Früchte)! Summanden der Permanente
+    bregman = sum(lgamma(degree + 1) / degree for degree in degrees)
+    bregman += (bowls - fruits) / bowls * lgamma(bowls + 1) - lgamma(bowls - fruits + 1)
+    return min(product, bregman) / log(10)
+
+
+class AssignmentCount:
+    """Anzahl der Zuordnungen, entweder exakt oder als obere Schranke"""
+    __slots__ = ("value", "log10", "exact")
+
+    value: int      # exakte Anzahl, bei einer Schranke 0
+
+    log10: float    # Logarithmus der Anzahl oder der oberen Schranke
+
+    exact: bool
+
+    def __init__(self, value: int = 1, log10: float = 0.0, exact: bool = True) -> None:
+        self.value = value
+        self.log10 = log10
+        self.exact = exact
+
+    @classmethod
+    def from_exact(cls, value: int) -> "AssignmentCount":
+        """erzeuge eine exakte Anzahl"""
+        return cls(value, log10(value) if value > 0 else float("-inf"), True)
+
+    @classmethod
+    def from_bound(cls, log10: float) -> "AssignmentCount":
+        """erzeuge eine obere Schranke aus ihrem Logarithmus"""
+        return cls(0, log10, False)
+
+    def __mul__(self, other: "AssignmentCount") -> "AssignmentCount":
+        """Anzahl der Zuordnungen zweier unabhängiger Teile"""
+        if self.exact and other.exact:
+            return AssignmentCount.from_exact(self.value * other.value)
+        if (self.exact and self.value == 0) or (other.exact and other.value == 0):
+            return AssignmentCount.from_exact(0)
+        return AssignmentCount.from_bound(self.log10 + other.log10)
+
+    def __str__(self) -> str:
+        if self.exact:
+            # str(int) ist quadratisch und scheitert ab 4300 Stellen, große Anzahlen daher über den Logarithmus
+            if self.value < 10 ** MAX_DIGITS:
+                return str(self.value)
+            exponent = floor(self.log10)
+            mantissa = round(10 ** (self.log10 - exponent), 3)
+            if mantissa >= 10:  # Rundung auf die nächste Zehnerpotenz
+                mantissa /= 10
+                exponent += 1
+            return f"etwa {mantissa:.3f} * 10^{exponent}"
+        return f"höchstens etwa 10^{self.log10:.1f}"
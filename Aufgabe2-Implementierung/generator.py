@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+"""Erzeugung zufälliger Eingaben für Aufgabe2 des 39. BWINF"""
+
+import sys
+import random
+import argparse
+from typing import TextIO, List, Tuple, Optional
+
+__version__ = "0.1"
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+
+argparser = argparse.ArgumentParser(
+    description=__doc__
+)
+argparser.add_argument(
+    "-v",
+    "--version",
+    help="zeige Versionsnummer",
+    action="version",
+    version=f"%(prog)s {__version__}"
+)
+argparser.add_argument(
+    "-n",
+    "--bowls",
+    help="Anzahl der Schüsseln und Früchte",
+    type=int,
+    default=10
+)
+argparser.add_argument(
+    "-s",
+    "--skewers",
+    help="Anzahl der Spieße",
+    type=int,
+    default=4
+)
+argparser.add_argument(
+    "-k",
+    "--size",
+    help="Anzahl der Früchte pro Spieß",
+    type=int,
+    default=4
+)
+argparser.add_argument(
+    "-a",
+    "--ambiguity",
+    help="Anteil der Früchte zwischen 0 und 1, welche immer paarweise auf Spießen vorkommen und sich daher nicht unterscheiden lassen",
+    type=float,
+    default=0.0
+)
+argparser.add_argument(
+    "-w",
+    "--wanted",
+    help="Anzahl der Wunschsorten, beim Fehlen ein Drittel der Früchte",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "-r",
+    "--seed",
+    help="Startwert des Zufallsgenerators, gleiche Startwerte erzeugen gleiche Dateien",
+    type=int,
+    default=0
+)
+argparser.add_argument(
+    "Datei",
+    type=argparse.FileType("w"),
+    help="Pfad zur Ausgabedatei, beim Fehlen wird auf Stdout geschrieben",
+    nargs="?",
+    default=sys.stdout
+)
+
+
+def generate(bowls: int, skewers: int, size: int, ambiguity: float = 0.0, wanted: Optional[int] = None,
+             seed: int = 0) -> Tuple[List[str], List[Tuple[List[str], List[int]]]]:
+    """erzeuge die Wunschsorten und Spieße zu einer zufälligen, gültigen Zuordnung von Früchten zu Schüsseln"""
+    if not 0 < size <= bowls:
+        raise ValueError(f"Anzahl der Früchte pro Spieß ({size}) muss zwischen 1 und {bowls} liegen")
+    if not 0.0 <= ambiguity <= 1.0:
+        raise ValueError(f"Anteil der ununterscheidbaren Früchte ({ambiguity}) muss zwischen 0 und 1 liegen")
+    rng = random.Random(seed)
+    fruits = [f"Frucht{number}" for number in range(1, bowls + 1)]
+    positions = list(range(1, bowls + 1))
+    rng.shuffle(positions)
+    assignment = dict(zip(fruits, positions))   # versteckte Zuordnung, welche alle Spieße erfüllen
+    # Gruppen von Früchten, welche immer zusammen auf Spießen vorkommen
+    order = fruits.copy()
+    rng.shuffle(order)
+    twins = int(bowls * ambiguity) // 2
+    groups = [order[2 * number:2 * number + 2] for number in range(twins)]
+    groups.extend([fruit] for fruit in order[2 * twins:])
+    result = []
+    for _ in range(skewers):
+        rng.shuffle(groups)
+        skewer: List[str] = []
+        for group in groups:
+            if len(skewer) + len(group) <= size:
+                skewer.extend(group)
+            if len(skewer) == size:
+                break
+        bowls_of_skewer = [assignment[fruit] for fruit in skewer]
+        rng.shuffle(bowls_of_skewer)    # die Reihenfolge der Schüsseln verrät nicht die Zuordnung
+        rng.shuffle(skewer)
+        result.append((skewer, bowls_of_skewer))
+    if wanted is None:
+        wanted = max(1, bowls // 3)
+    return rng.sample(fruits, min(wanted, bowls)), result
+
+
+def write_input(file: TextIO, bowls: int, wanted: List[str], skewers: List[Tuple[List[str], List[int]]]) -> None:
+    """schreibe die Daten im Format der Aufgabe"""
+    file.write(f"{bowls}\n")
+    file.write(" ".join(wanted) + "\n")
+    file.write(f"{len(skewers)}\n")
+    for fruits, bowls_of_skewer in skewers:
+        file.write(" ".join(map(str, bowls_of_skewer)) + "\n")
+        file.write(" ".join(fruits) + "\n")
+
+
+if __name__ == "__main__":
+    args = argparser.parse_args()
+    wanted, skewers = generate(args.bowls, args.skewers, args.size, args.ambiguity, args.wanted, args.seed)
+    write_input(args.Datei, args.bowls, wanted, skewers)
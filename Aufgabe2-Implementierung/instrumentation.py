@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+"""Messung von Laufzeiten und Zählern der Algorithmen, ohne Kosten im ausgeschalteten Zustand"""
+
+import json
+import time
+from contextlib import contextmanager
+from typing import Iterator, Dict, Any, Optional
+
+try:
+    import resource
+except ImportError:     # nicht auf allen Plattformen verfügbar
+    resource = None
+
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+
+class Profiler:
+    """Sammlung der Laufzeiten aller Phasen und der Zähler der Algorithmen"""
+    __slots__ = ("phases", "counters", "max_depth")
+
+    phases: Dict[str, float]
+
+    counters: Dict[str, int]
+
+    max_depth: int
+
+    def __init__(self) -> None:
+        self.phases = {}
+        self.counters = {}
+        self.max_depth = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """miss die Laufzeit einer Phase, mehrere Messungen einer Phase werden addiert"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """erhöhe einen Zähler"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def node(self, name: str, depth: int) -> None:
+        """zähle einen Knoten einer Rekursion und dessen Tiefe"""
+        self.counters[name] = self.counters.get(name, 0) + 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def summary(self) -> Dict[str, Any]:
+        """gebe alle Messwerte als Dictionary zurück"""
+        peak = None
+        if resource is not None:    # maximaler Speicherbedarf des Prozesses in Kilobyte (Linux)
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+            "max_depth": self.max_depth,
+            "peak_memory_kb": peak
+        }
+
+    def format(self, style: str = "text") -> str:
+        """formatiere die Messwerte als Text oder JSON"""
+        summary = self.summary()
+        if style == "json":
+            return json.dumps(summary, ensure_ascii=False)
+        lines = ["Laufzeiten:"]
+        for name, seconds in summary["phases"].items():
+            lines.append(f"  {name}: {seconds:.6f}s")
+        lines.append("Zähler:")
+        for name, value in summary["counters"].items():
+            lines.append(f"  {name}: {value}")
+        lines.append(f"  maximale Rekursionstiefe: {summary['max_depth']}")
+        if summary["peak_memory_kb"] is not None:
+            lines.append(f"  maximaler Speicherbedarf: {summary['peak_memory_kb']} kB")
+        return "\n".join(lines)
+
+
+# aktiver Profiler oder None, die Algorithmen prüfen nur auf None und messen im ausgeschalteten Zustand nichts
+profiler: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    """schalte die Messungen ein und gebe den aktiven Profiler zurück"""
+    global profiler
+    profiler = Profiler()
+    return profiler
+
+
+def disable() -> None:
+    """schalte die Messungen aus"""
+    global profiler
+    profiler = None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """miss die Laufzeit einer Phase, falls die Messungen eingeschaltet sind"""
+    if profiler is None:
+        yield
+    else:
+        with profiler.phase(name):
+            yield
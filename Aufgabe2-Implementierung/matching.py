@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+
+"""Algorithmen für Paarungen in bipartiten Graphen aus Früchten und Schüsseln"""
+
+from collections import deque
+from typing import Iterable, Iterator, Mapping, Dict, List, Set, Tuple, Hashable, Optional, TypeVar
+import instrumentation
+
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+K = TypeVar("K", bound=Hashable)
+
+
+def find_matching(adjacency: Mapping[K, Iterable[int]], matching: Optional[Mapping[K, int]] = None) -> Dict[K, int]:
+    """ermittle eine maximale Paarung mit dem Algorithmus von Hopcroft und Karp"""
+    match_left: Dict[K, int] = {}      # Frucht -> Schüssel
+    match_right: Dict[int, K] = {}     # Schüssel -> Frucht
+    if matching is not None:    # übernehme noch gültige Paare einer vorherigen Paarung
+        for left, right in matching.items():
+            if left in adjacency and right in adjacency[left] and right not in match_right:
+                match_left[left] = right
+                match_right[right] = left
+    while True:
+        if instrumentation.profiler is not None:
+            instrumentation.profiler.count("Phasen (Hopcroft-Karp)")
+        # Breitensuche von allen freien Früchten aus, welche die Früchte in Schichten einteilt
+        layers: Dict[K, Optional[int]] = {}
+        queue = deque()
+        for left in adjacency:
+            if left not in match_left:
+                layers[left] = 0
+                queue.append(left)
+        found = False
+        while queue:
+            left = queue.popleft()
+            for right in adjacency[left]:
+                other = match_right.get(right)
+                if other is None:
+                    found = True    # freie Schüssel erreicht, es existiert ein augmentierender Pfad
+                elif other not in layers:
+                    layers[other] = layers[left] + 1
+                    queue.append(other)
+        if not found:   # kein augmentierender Pfad mehr vorhanden, die Paarung ist maximal
+            return match_left
+        # Tiefensuche entlang der Schichten, welche knotendisjunkte augmentierende Pfade findet
+        for root in [left for left in adjacency if left not in match_left]:
+            stack = [(root, iter(adjacency[root]))]
+            chosen: List[int] = []  # gewählte Schüssel jeder Ebene des Stapels
+            while stack:
+                left, rights = stack[-1]
+                for right in rights:
+                    other = match_right.get(right)
+                    if other is None:   # augmentiere entlang des Pfades
+                        chosen.append(right)
+                        for (path_left, _), path_right in zip(stack, chosen):
+                            match_left[path_left] = path_right
+                            match_right[path_right] = path_left
+                        stack.clear()
+                        break
+                    layer = layers.get(other)
+                    if layer is not None and layer == layers[left] + 1:
+                        chosen.append(right)
+                        stack.append((other, iter(adjacency[other])))
+                        break
+                else:   # Sackgasse, die Frucht wird für diese Phase nicht mehr besucht
+                    layers[left] = None
+                    stack.pop()
+                    if chosen:
+                        chosen.pop()
+
+
+def strongly_connected(graph: Mapping[K, Iterable[K]]) -> Dict[K, int]:
+    """ermittle die starken Zusammenhangskomponenten eines gerichteten Graphen (Tarjan, iterativ)"""
+    components: Dict[K, int] = {}
+    index: Dict[K, int] = {}
+    lowlink: Dict[K, int] = {}
+    stack: List[K] = []
+    on_stack: Set[K] = set()
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work: List[Tuple[K, Iterator[K]]] = [(root, iter(graph[root]))]
+        while work:
+            node, neighbours = work[-1]
+            for neighbour in neighbours:
+                if neighbour not in index:  # steige in den Nachbarn ab
+                    index[neighbour] = lowlink[neighbour] = len(index)
+                    stack.append(neighbour)
+                    on_stack.add(neighbour)
+                    work.append((neighbour, iter(graph[neighbour])))
+                    break
+                elif neighbour in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbour])
+            else:   # alle Nachbarn besucht
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:    # node ist die Wurzel einer Komponente
+                    component = len(components)
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        components[member] = component
+                        if member == node:
+                            break
+    return components
+
+
+def alternating_graph(adjacency: Mapping[K, Iterable[int]], matching: Mapping[K, int]) -> Dict[K, List[K]]:
+    """bilde den alternierenden Graphen auf den Früchten, die Kanten führen über eine Schüssel zu deren gepaarter Frucht"""
+    match_right = {right: left for left, right in matching.items()}
+    graph: Dict[K, List[K]] = {}
+    for left, rights in adjacency.items():
+        own = matching.get(left)
+        graph[left] = [match_right[right] for right in rights if right != own and right in match_right]
+    return graph
+
+
+def possible_pairs(adjacency: Mapping[K, Iterable[int]], matching: Mapping[K, int]) -> Dict[K, Set[int]]:
+    """ermittle alle Paare, welche in einer Paarung mit allen Früchten vorkommen können (Dulmage-Mendelsohn)"""
+    # Voraussetzung: 'matching' ist eine Paarung, welche alle Früchte enthält
+    match_right = {right: left for left, right in matching.items()}
+    graph = alternating_graph(adjacency, matching)
+    components = strongly_connected(graph)
+    # Früchte, welche über einen alternierenden Pfad ihre Schüssel für eine freie Schüssel aufgeben können
+    reverse: Dict[K, List[K]] = {left: [] for left in graph}
+    for left, neighbours in graph.items():
+        for neighbour in neighbours:
+            reverse[neighbour].append(left)
+    released = [left for left, rights in adjacency.items() if any(right not in match_right for right in rights)]
+    releasable = set(released)
+    queue = deque(released)
+    while queue:
+        for left in reverse[queue.popleft()]:
+            if left not in releasable:
+                releasable.add(left)
+                queue.append(left)
+    possible: Dict[K, Set[int]] = {}
+    for left, rights in adjacency.items():
+        bowls = possible[left] = set()
+        for right in rights:
+            other = match_right.get(right)
+            if other is None or other == left:  # freie oder eigene Schüssel
+                bowls.add(right)
+            elif components[other] == components[left] or other in releasable:  # alternierender Kreis oder Pfad
+                bowls.add(right)
+    return possible
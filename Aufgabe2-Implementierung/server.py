@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+
+"""Dauerhafter Modus für Aufgabe2 des 39. BWINF, welcher viele Wunschlisten zu den selben Spießen beantwortet"""
+
+import sys
+import os
+import json
+import hashlib
+import argparse
+from typing import TextIO, Iterable, Iterator, Tuple, List, Set, Optional
+import A2
+
+__version__ = "0.1"
+__author__ = "Eric Wolf"
+__email__ = "robo-eric@gmx.de"
+
+
+argparser = argparse.ArgumentParser(
+    description=__doc__,
+    epilog="Befehle auf Stdin: 'query FRUCHT...' ermittelt die Schüsseln einer Wunschliste, "
+           "'add SCHÜSSEL... | FRUCHT...' fügt einen Spieß hinzu, 'quit' beendet den Modus"
+)
+argparser.add_argument(
+    "-v",
+    "--version",
+    help="zeige Versionsnummer",
+    action="version",
+    version=f"%(prog)s {__version__}"
+)
+argparser.add_argument(
+    "-e",
+    "--engine",
+    help="Name des Algorithmus (backtracking, uno, matching)",
+    default="matching"
+)
+argparser.add_argument(
+    "-c",
+    "--cache",
+    help="Ordner, in welchem die reduzierten Kandidaten gespeichert werden, beim Fehlen wird nichts gespeichert",
+    default=None
+)
+argparser.add_argument(
+    "Datei",
+    type=argparse.FileType("r"),
+    help="Pfad zu einer Datei mit den Spießen, die Wunschsorten der Datei werden ignoriert"
+)
+
+
+class CandidateServer:
+    """reduzierte Kandidaten der Spieße, welche für beliebige Wunschlisten verwendet werden"""
+    __slots__ = ("all_bowls", "candidates", "hash", "engine", "cache", "possible", "invalid")
+
+    all_bowls: Set[int]
+
+    candidates: A2.Candidates
+
+    hash: "hashlib._Hash"   # Hash aller bisherigen Spieße, bestimmt den Eintrag im Cache
+
+    engine: A2.Engine
+
+    cache: Optional[str]
+
+    possible: Optional[A2.Candidates]   # None, falls seit dem letzten Hinzufügen von Spießen nicht reduziert wurde
+
+    invalid: bool   # die Spieße besitzen keine Zuordnung
+
+    def __init__(self, all_bowls: Set[int], engine: A2.Engine, cache: Optional[str] = None) -> None:
+        self.all_bowls = all_bowls
+        self.candidates = A2.Candidates(all_bowls)
+        self.hash = hashlib.sha256(f"{len(all_bowls)}\n".encode())
+        self.engine = engine
+        self.cache = cache
+        self.possible = None
+        self.invalid = False
+
+    def add_skewer(self, fruits: List[str], bowls: List[int]) -> None:
+        """füge einen Spieß hinzu, die reduzierten Kandidaten werden dadurch ungültig"""
+        if len(fruits) != len(bowls):
+            raise ValueError("Anzahl der Früchte und Schüsseln des Spießes stimmen nicht überein")
+        self.candidates.add_skewer(fruits, bowls)
+        # der Hash hängt von allen Spießen ab, neue Spieße ergeben einen neuen Eintrag im Cache
+        self.hash.update((" ".join(map(str, bowls)) + "\n" + " ".join(fruits) + "\n").encode())
+        self.possible = None
+
+    def add_skewers(self, skewers: Iterator[Tuple[List[str], List[int]]]) -> None:
+        """füge mehrere Spieße hinzu"""
+        for fruits, bowls in skewers:
+            self.add_skewer(fruits, bowls)
+
+    def cache_path(self) -> Optional[str]:
+        """gebe den Pfad des Eintrags der aktuellen Spieße im Cache zurück"""
+        if self.cache is None:
+            return None
+        return os.path.join(self.cache, self.hash.hexdigest() + ".json")
+
+    def load(self) -> bool:
+        """lade die reduzierten Kandidaten aus dem Cache, falls vorhanden"""
+        path = self.cache_path()
+        if path is None or not os.path.exists(path):
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):   # beschädigter Eintrag, berechne neu
+            return False
+        self.invalid = data["invalid"]
+        self.possible = A2.Candidates(self.all_bowls)
+        for fruit, bowls in data["possible"].items():
+            self.possible[fruit] = set(bowls)
+        return True
+
+    def store(self) -> None:
+        """speichere die reduzierten Kandidaten im Cache"""
+        path = self.cache_path()
+        if path is None:
+            return
+        os.makedirs(self.cache, exist_ok=True)
+        data = {
+            "invalid": self.invalid,
+            "possible": {fruit: sorted(bowls) for fruit, bowls in self.possible.items()}
+        }
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temporary, path)     # andere Prozesse sehen nie einen halb geschriebenen Eintrag
+
+    def reduce(self) -> None:
+        """entferne die unmöglichen Kandidaten der Früchte aus den Spießen, falls nötig"""
+        if self.possible is not None or self.load():
+            return
+        # Früchte ohne Spieß erhalten nur Schüsseln ohne Frucht aus den Spießen und bilden einen unabhängigen Teil,
+        # die Früchte der Spieße können daher ohne die Wunschliste reduziert werden
+        self.invalid = False
+        if len(self.candidates) == 0:
+            self.possible = A2.Candidates(self.all_bowls)
+        else:
+            try:
+                self.possible = getattr(self.candidates, self.engine.load())()
+            except A2.InvalidDataError:
+                self.invalid = True
+                self.possible = A2.Candidates(self.all_bowls)
+        self.store()
+
+    def query(self, wanted: Iterable[str]) -> Set[int]:
+        """ermittle die Schüsseln einer Wunschliste"""
+        self.reduce()
+        if self.invalid:
+            raise A2.InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+        wanted = list(dict.fromkeys(wanted))
+        unknown = [fruit for fruit in wanted if fruit not in self.possible]
+        solution = set()
+        if unknown:     # Wunschsorten ohne Spieß können auf jeder Schüssel ohne Frucht aus den Spießen liegen
+            unknown_bowls = self.all_bowls - set().union(*self.candidates.values())
+            if len(unknown) > len(unknown_bowls):
+                raise A2.InvalidDataError("Es gibt keine möglichen Zuordnungen von Früchten und Schüsseln, Daten fehlerhaft")
+            solution |= unknown_bowls
+        solution |= self.possible.bowls(fruit for fruit in wanted if fruit in self.possible)
+        if len(solution) != len(wanted):    # Lösung enthält unerwünschte Früchte
+            raise A2.MissingDataError(f"es müssen mehr Schüsseln ({solution}) als gewünschte Früchte besucht werden")
+        return solution
+
+
+def handle(server: CandidateServer, line: str) -> Optional[str]:
+    """bearbeite einen Befehl und gebe die Antwort zurück, None beendet den Modus"""
+    command, _, rest = line.strip().partition(" ")
+    try:
+        if command == "query":
+            return "OK " + " ".join(map(str, sorted(server.query(rest.split()))))
+        elif command == "add":
+            bowls, separator, fruits = rest.partition("|")
+            if not separator:
+                raise ValueError("Schüsseln und Früchte müssen durch '|' getrennt werden")
+            server.add_skewer(fruits.split(), [int(bowl) for bowl in bowls.split()])
+            return "OK"
+        elif command == "quit":
+            return None
+        else:
+            raise ValueError(f"unbekannter Befehl {command!r}")
+    except ValueError as error:     # auch InvalidDataError und MissingDataError
+        return f"ERROR {type(error).__name__}: {error}"
+
+
+def serve(server: CandidateServer, requests: TextIO = sys.stdin, responses: TextIO = sys.stdout) -> None:
+    """beantworte Befehle zeilenweise, bis 'quit' oder das Ende der Eingabe erreicht wird"""
+    for line in requests:
+        if not line.strip():
+            continue
+        response = handle(server, line)
+        if response is None:
+            break
+        print(response, file=responses, flush=True)
+
+
+if __name__ == "__main__":
+    args = argparser.parse_args()
+    if args.engine not in A2.ENGINES:
+        argparser.error(f"unbekannter Algorithmus {args.engine}, verfügbar sind {', '.join(A2.ENGINES)}")
+    all_bowls, _, skewers = A2.parse_input(args.Datei)
+    server = CandidateServer(all_bowls, A2.ENGINES[args.engine], args.cache)
+    server.add_skewers(skewers)
+    server.reduce()     # die erste Anfrage muss nicht auf die Reduktion warten
+    serve(server)
@@ -3,10 +3,24 @@
 """Lösung für Aufgabe 3 des 39. BWINF Stufe 2"""
 
 import sys
+import time
+from array import array
+from collections import OrderedDict
 from enum import Enum
+from math import comb, isqrt
+from mmap import mmap
+from multiprocessing.shared_memory import SharedMemory
+from tempfile import TemporaryFile
 from argparse import ArgumentParser, FileType
+from bisect import bisect_left, bisect_right
 from itertools import combinations
-from typing import TextIO, Tuple, Iterator, Sequence, List
+from random import Random
+from typing import TextIO, Tuple, Iterator, Iterable, Sequence, MutableSequence, List, Dict, Any, Optional, Union, overload
+
+try:
+    import numpy
+except ImportError:     # wird nur für --numpy benötigt
+    numpy = None
 
 
 argparser = ArgumentParser(__doc__)
@@ -23,6 +37,63 @@ argparser.add_argument(
     type=int,
     default=3
 )
+argparser.add_argument(
+    "-p",
+    "--pruned",
+    help="simuliere nur Wahlen für Positionen, welche noch stabil sein können, anstatt aller Paare",
+    action="store_true"
+)
+argparser.add_argument(
+    "-r",
+    "--representatives",
+    help="suche bessere Positionen nur unter Repräsentanten von Abschnitten des Rings (benötigt --pruned)",
+    action="store_true"
+)
+argparser.add_argument(
+    "-o",
+    "--oracle",
+    help="prüfe jede Position einzeln, indem die meisten Stimmen eines beliebigen Herausforderers berechnet werden",
+    action="store_true"
+)
+argparser.add_argument(
+    "-j",
+    "--processes",
+    help="Anzahl der Prozesse, auf welche die Wahlen verteilt werden, beim Fehlen wird nur ein Prozess benutzt",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "-t",
+    "--time",
+    help="suche lokal nach stabilen Positionen und gebe nach dieser Anzahl an Sekunden die besten Kandidaten aus",
+    type=float,
+    default=None
+)
+argparser.add_argument(
+    "--votes",
+    help="wie --time, jedoch wird nach dieser Anzahl an Wahlen abgebrochen",
+    type=int,
+    default=None
+)
+argparser.add_argument(
+    "--seed",
+    help="Startwert des Zufallsgenerators der lokalen Suche",
+    type=int,
+    default=0
+)
+argparser.add_argument(
+    "-n",
+    "--numpy",
+    help="simuliere die Wahlen vektorisiert mit einer vorberechneten Tabelle der Distanzen (benötigt NumPy)",
+    action="store_true"
+)
+argparser.add_argument(
+    "-c",
+    "--cache",
+    help="Speicherbudget in MiB für die Distanzen der Positionen, 0 schaltet den Cache ab",
+    type=float,
+    default=0
+)
 argparser.add_argument(
     "Datei",
     help="Datei mit Daten des Dorfes (beim Fehlen wird von der Standarteingabe gelesen)",
@@ -45,16 +116,262 @@ class VoteResult(Enum):
     DRAW = 2
 
 
+class MaxTree:
+    """Segmentbaum, welcher Bereiche einer festen Folge von Werten erhöht und ihr Maximum ermittelt"""
+    __slots__ = ("size", "height", "maxima", "pending")
+
+    size: int   # Anzahl der Blätter, eine Zweierpotenz
+
+    height: int
+
+    maxima: List[float]     # Maximum jedes Teilbaums ohne die ausstehenden Erhöhungen seiner Vorfahren
+
+    pending: List[float]    # noch nicht an die Kinder weitergegebene Erhöhung jedes inneren Knotens
+
+    def __init__(self, values: Sequence[float]) -> None:
+        self.height = max(len(values) - 1, 0).bit_length()
+        self.size = 1 << self.height
+        self.maxima = [float("-inf")] * self.size + list(values) + [float("-inf")] * (self.size - len(values))
+        for node in range(self.size - 1, 0, -1):
+            self.maxima[node] = max(self.maxima[2 * node], self.maxima[2 * node + 1])
+        self.pending = [0] * self.size
+
+    def apply(self, node: int, value: float) -> None:
+        """erhöhe alle Werte unterhalb eines Knotens"""
+        self.maxima[node] += value
+        if node < self.size:
+            self.pending[node] += value
+
+    def rebuild(self, node: int) -> None:
+        """aktualisiere die Maxima aller Vorfahren eines Knotens"""
+        while node > 1:
+            node >>= 1
+            self.maxima[node] = max(self.maxima[2 * node], self.maxima[2 * node + 1]) + self.pending[node]
+
+    def push(self, node: int) -> None:
+        """gebe die ausstehenden Erhöhungen aller Vorfahren eines Knotens an ihre Kinder weiter"""
+        for shift in range(self.height, 0, -1):
+            parent = node >> shift
+            if self.pending[parent]:
+                self.apply(2 * parent, self.pending[parent])
+                self.apply(2 * parent + 1, self.pending[parent])
+                self.pending[parent] = 0
+
+    def add(self, start: int, stop: int, value: float) -> None:
+        """erhöhe die Werte mit einem Index in [start, stop)"""
+        if start >= stop:
+            return
+        start += self.size
+        stop += self.size
+        first, last = start, stop - 1
+        while start < stop:
+            if start & 1:
+                self.apply(start, value)
+                start += 1
+            if stop & 1:
+                stop -= 1
+                self.apply(stop, value)
+            start >>= 1
+            stop >>= 1
+        self.rebuild(first)
+        self.rebuild(last)
+
+    def maximum(self, start: int, stop: int) -> float:
+        """ermittle das Maximum der Werte mit einem Index in [start, stop)"""
+        if start >= stop:
+            return float("-inf")
+        start += self.size
+        stop += self.size
+        self.push(start)
+        self.push(stop - 1)
+        result = float("-inf")
+        while start < stop:
+            if start & 1:
+                result = max(result, self.maxima[start])
+                start += 1
+            if stop & 1:
+                stop -= 1
+                result = max(result, self.maxima[stop])
+            start >>= 1
+            stop >>= 1
+        return result
+
+
+def chain_coverage(intervals: List[Tuple[int, int]], candidates: List[int], points: int, last: Optional[int] = None) -> List[float]:
+    """ermittle für jeden der aufsteigend sortierten Kandidaten, wie viele der Intervalle [Anfang, Ende] höchstens von 'points'
+    Punkten getroffen werden, deren kleinster beim Kandidaten und, falls 'last' gegeben ist, deren größter dort oder dahinter liegt"""
+    # jeder weitere Punkt kann bis zum nächsten Anfang eines nur von ihm getroffenen Intervalls nach links verschoben werden,
+    # daher genügen die Anfänge als Kandidaten
+    starts = sorted(start for start, _ in intervals)
+    ends = sorted(end for _, end in intervals)
+    by_start = sorted(intervals)
+    by_end = sorted(intervals, key=lambda interval: interval[1])
+    single = [  # Präfixzählung: begonnene minus bereits beendete Intervalle
+        bisect_right(starts, point) - bisect_left(ends, point) if last is None or point >= last else float("-inf")
+        for point in candidates
+    ]
+    best = single
+    for _ in range(points - 1):
+        # von rechts nach links: ein Punkt vor der Kette ab y trifft zusätzlich die ihn enthaltenden Intervalle, welche vor y enden,
+        # der Segmentbaum enthält für jedes y den Wert der Kette zuzüglich der Anzahl dieser Intervalle für den aktuellen Punkt
+        tree = MaxTree(best)
+        chains = []
+        activated = len(by_end)
+        deactivated = len(by_start)
+        for number in range(len(candidates) - 1, -1, -1):
+            point = candidates[number]
+            while activated > 0 and by_end[activated - 1][1] >= point:
+                activated -= 1
+                tree.add(bisect_right(candidates, by_end[activated][1]), len(candidates), 1)
+            while deactivated > 0 and by_start[deactivated - 1][0] > point:
+                deactivated -= 1
+                tree.add(bisect_right(candidates, by_start[deactivated][1]), len(candidates), -1)
+            chains.append(max(single[number], tree.maximum(number + 1, len(candidates))))
+        best = chains[::-1]
+    return best
+
+
+def counter_array(length: int, typecode: str, threshold: int = 1 << 26) -> MutableSequence[int]:
+    """erzeuge ein mit 0 gefülltes, kompaktes Array, welches ab 'threshold' Bytes in eine temporäre Datei abgebildet wird"""
+    size = array(typecode).itemsize * length
+    if size < threshold or size == 0:
+        return array(typecode, bytes(size))
+    # das Betriebssystem lagert die Seiten bei Bedarf in die Datei aus, der Arbeitsspeicher begrenzt die Länge nicht
+    with TemporaryFile() as file:
+        file.truncate(size)
+        return memoryview(mmap(file.fileno(), size)).cast(typecode)
+
+
+class PositionSpace(Sequence[Tuple[int, ...]]):
+    """alle Positionierungen der Buden in der Reihenfolge von itertools.combinations, ohne diese zu speichern"""
+    # der Index einer Positionierung wird mit dem kombinatorischen Zahlensystem berechnet
+    __slots__ = ("adresses", "stalls", "length")
+
+    adresses: int
+
+    stalls: int
+
+    length: int
+
+    def __init__(self, adresses: int, stalls: int) -> None:
+        self.adresses = adresses
+        self.stalls = stalls
+        self.length = comb(adresses, stalls) if stalls >= 0 else 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[int, ...]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Tuple[int, ...]]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Tuple[int, ...], Sequence[Tuple[int, ...]]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step == 1:
+                return list(self.iterate(start, stop))
+            return [self.unrank(rank) for rank in range(start, stop, step)]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Index der Positionierung außerhalb des gültigen Bereichs")
+        return self.unrank(index)
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        return combinations(range(self.adresses), self.stalls)   # Adressen sind 0 bis Adressen - 1
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple) or len(position) != self.stalls:
+            return False
+        previous = -1
+        for stall in position:  # die Adressen müssen aufsteigend und gültig sein
+            if not isinstance(stall, int) or not previous < stall < self.adresses:
+                return False
+            previous = stall
+        return True
+
+    def index(self, position: Tuple[int, ...], start: int = 0, stop: Optional[int] = None) -> int:
+        if position not in self:
+            raise ValueError(f"{position} ist keine Positionierung")
+        rank = self.rank(position)
+        if not start <= rank < (self.length if stop is None else stop):
+            raise ValueError(f"{position} liegt nicht im Bereich")
+        return rank
+
+    def rank(self, position: Sequence[int]) -> int:
+        """ermittle den Index einer Positionierung"""
+        rank = 0
+        previous = -1
+        for remaining, stall in zip(range(self.stalls, 0, -1), position):
+            # überspringe alle Positionierungen, deren nächste Bude zwischen der vorherigen und 'stall' steht
+            rank += comb(self.adresses - previous - 1, remaining) - comb(self.adresses - stall, remaining)
+            previous = stall
+        return rank
+
+    def unrank(self, rank: int) -> Tuple[int, ...]:
+        """ermittle die Positionierung mit dem angegebenen Index"""
+        position = []
+        previous = -1
+        for remaining in range(self.stalls, 0, -1):
+            # suche die größte Adresse, vor welcher höchstens 'rank' Positionierungen übersprungen werden
+            total = comb(self.adresses - previous - 1, remaining)
+            low, high = previous + 1, self.adresses - remaining
+            while low < high:
+                middle = (low + high + 1) // 2
+                if total - comb(self.adresses - middle, remaining) <= rank:
+                    low = middle
+                else:
+                    high = middle - 1
+            rank -= total - comb(self.adresses - low, remaining)
+            position.append(low)
+            previous = low
+        return tuple(position)
+
+    def iterate(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, ...]]:
+        """gebe die Positionierungen von 'start' bis 'stop' zurück, ohne die vorherigen zu erzeugen"""
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return
+        position = list(self.unrank(start))
+        for _ in range(start, stop - 1):
+            yield tuple(position)
+            # erhöhe die letzte Bude, welche noch nicht ihre größtmögliche Adresse besitzt, und setze die folgenden dahinter
+            slot = self.stalls - 1
+            while position[slot] == self.adresses - self.stalls + slot:
+                slot -= 1
+            position[slot] += 1
+            for following in range(slot + 1, self.stalls):
+                position[following] = position[following - 1] + 1
+        yield tuple(position)
+
+
 class Village:
-    __slots__ = ("adresses", "houses")
+    __slots__ = ("adresses", "houses", "ring", "budget", "cache", "cache_bytes")
 
     adresses: int
 
     houses: List[int]
 
-    def __init__(self, adresses: int, houses: List[int]) -> None:
+    ring: List[int]     # sortierte Adressen der Häuser, danach nochmals um eine Umrundung verschoben
+
+    budget: int     # Speicherbudget des Caches in Bytes, 0 schaltet ihn ab
+
+    cache: "OrderedDict[Tuple[int, ...], Sequence[int]]"   # Position -> Distanzen aller Häuser, zuletzt benutzte am Ende
+
+    cache_bytes: int    # Speicherbedarf der Distanzen im Cache
+
+    def __init__(self, adresses: int, houses: List[int], budget: int = 0) -> None:
         self.adresses = adresses
         self.houses = houses
+        ordered = sorted(houses)
+        self.ring = ordered + [house + adresses for house in ordered]
+        self.budget = budget
+        self.cache = OrderedDict()
+        self.cache_bytes = 0
 
     def distance(self, house: int, position: Sequence[int]) -> int:
         """ermittle die Distanz zur nächsten Eisbude"""
@@ -65,12 +382,52 @@ class Village:
             distances.append(distance1 if distance1 < distance2 else distance2)
         return min(distances)
 
-    def simulate_vote(self, position1: Sequence[int], position2: Sequence[int]) -> VoteResult:
-        """Simuliere eine Wahl zwischen zwei Positionen"""
-        approved = 0    # Anzahl der Stimmen für position2
-        for house in self.houses:
-            if self.distance(house, position2) < self.distance(house, position1):
+    def compute_distances(self, position: Sequence[int]) -> Sequence[int]:
+        """ermittle die Distanzen aller Häuser zur jeweils nächsten Eisbude"""
+        return array("I", (self.distance(house, position) for house in self.houses))
+
+    def vector_size(self) -> int:
+        """ermittle den Speicherbedarf der Distanzen einer Position in Bytes"""
+        return array("I").itemsize * len(self.houses)
+
+    def capacity(self) -> Optional[int]:
+        """ermittle die Anzahl an Positionen, deren Distanzen in den Cache passen, None falls er abgeschaltet ist"""
+        if self.budget <= 0:
+            return None
+        return self.budget // max(self.vector_size(), 1)
+
+    def distances(self, position: Tuple[int, ...]) -> Sequence[int]:
+        """ermittle die Distanzen aller Häuser zur jeweils nächsten Eisbude, mit Cache falls eingeschaltet"""
+        if self.budget <= 0:
+            return self.compute_distances(position)
+        try:
+            vector = self.cache[position]
+        except KeyError:
+            vector = self.cache[position] = self.compute_distances(position)
+            self.cache_bytes += vector.itemsize * len(vector)
+            while self.cache_bytes > self.budget and len(self.cache) > 1:   # entferne die am längsten nicht benutzten Distanzen
+                _, evicted = self.cache.popitem(last=False)
+                self.cache_bytes -= evicted.itemsize * len(evicted)
+        else:
+            self.cache.move_to_end(position)
+        return vector
+
+    def approvals(self, position1: Tuple[int, ...], position2: Tuple[int, ...]) -> int:
+        """ermittle die Anzahl der Häuser, welche position2 gegenüber position1 bevorzugen"""
+        approved = 0
+        if self.budget <= 0:    # ohne Cache lohnt sich das Erzeugen der Distanzen nicht, vergleiche direkt
+            for house in self.houses:
+                if self.distance(house, position2) < self.distance(house, position1):
+                    approved += 1
+            return approved
+        for distance1, distance2 in zip(self.distances(position1), self.distances(position2)):
+            if distance2 < distance1:
                 approved += 1
+        return approved
+
+    def simulate_vote(self, position1: Tuple[int, ...], position2: Tuple[int, ...]) -> VoteResult:
+        """Simuliere eine Wahl zwischen zwei Positionen"""
+        approved = self.approvals(position1, position2)     # Anzahl der Stimmen für position2
         half = len(self.houses) / 2
         if approved > half:
             return VoteResult.ACCEPTED
@@ -79,31 +436,463 @@ class Village:
         else:
             return VoteResult.DRAW
 
-    def positions(self, stalls: int) -> Iterator[Tuple[int, ...]]:
+    def positions(self, stalls: int) -> PositionSpace:
         """ermittle alle möglichen Positionierungen der Buden"""
-        return combinations(range(self.adresses), stalls)   # Adressen sind 0 bis Adressen - 1
+        return PositionSpace(self.adresses, stalls)
 
+    def cells(self, distances: Sequence[int]) -> List[Tuple[int, int, int, int]]:
+        """zerlege die Adressen in Abschnitte, deren Buden gegen eine Position mit den Distanzen 'distances' dieselben Häuser gewinnen"""
+        # eine Bude gewinnt ein Haus, falls sie näher als dessen Distanz liegt, und nimmt es der Position, falls sie höchstens
+        # dessen Distanz entfernt liegt, beides ändert sich nur an den Rändern der Bögen um das Haus
+        bounds = {0, self.adresses}
+        for house, distance in zip(self.houses, distances):
+            for offset in (-distance, 1 - distance, distance, distance + 1):
+                bounds.add((house + offset) % self.adresses)
+        bounds = sorted(bounds)
+        cells = []  # Anfang, Ende, Bitmaske der gewonnenen und der nicht verlorenen Häuser jedes Abschnitts
+        for start, stop in zip(bounds, bounds[1:]):
+            won = covered = 0
+            for bit, (house, distance) in enumerate(zip(self.houses, distances)):
+                stall_distance = self.distance(house, (start,))
+                if stall_distance < distance:
+                    won |= 1 << bit
+                if stall_distance <= distance:
+                    covered |= 1 << bit
+            cells.append((start, stop, won, covered))
+        return cells
 
-def main(positions: List[Tuple[int, ...]], village: Village, lazy: bool) -> None:
-    """Brute-Force Implementierung"""
-    better_positions = [0] * len(positions)     # speichere für jede Positionierung die Anzahl an besseren Positionierungen
-    for index1, position1 in enumerate(positions):
-        next_index = index1 + 1
-        for index2, position2 in enumerate(positions[next_index:], start=next_index):     # teste alle Kombinationen
-            vote = village.simulate_vote(position1, position2)
+    def arcs(self, distances: Sequence[int], closed: bool) -> List[Tuple[int, int]]:
+        """ermittle für jedes Haus den Bogen aus Anfang und Länge, auf welchem eine Bude es gegen eine Position mit den Distanzen
+        'distances' gewinnt oder, falls 'closed', es der Position zumindest nicht überlässt"""
+        arcs = []
+        for house, distance in zip(self.houses, distances):
+            reach = distance if closed else distance - 1
+            if reach < 0:   # das Haus kann nicht gewonnen werden
+                arcs.append((house, 0))
+            else:
+                arcs.append(((house - reach) % self.adresses, min(2 * reach + 1, self.adresses)))
+        return arcs
+
+    def contains(self, arc: Tuple[int, int], address: int) -> bool:
+        """ermittle, ob ein Bogen eine Adresse enthält"""
+        start, length = arc
+        return (address - start) % self.adresses < length
+
+    def clip(self, arcs: Iterable[Tuple[int, int]], address: int, limit: int) -> List[Tuple[int, int]]:
+        """schneide den Ring hinter 'address' auf und gebe die Bögen, welche 'address' nicht enthalten,
+        als Intervalle der Abstände 1 bis 'limit' im Uhrzeigersinn zurück"""
+        intervals = []
+        for start, length in arcs:
+            offset = (start - address) % self.adresses
+            if length > 0 and 0 < offset <= limit:
+                intervals.append((offset, min(offset + length - 1, limit)))
+        return intervals
+
+    def max_wins(self, position: Tuple[int, ...]) -> int:
+        """ermittle, wie viele Häuser eine beliebige Positionierung höchstens gegen 'position' gewinnt"""
+        # ein Haus zwischen den benachbarten Buden a und b kann nur eine Bude zwischen ihnen gewinnen, eine Bude bei p gewinnt
+        # die Häuser zwischen den Mittelpunkten (a + p) / 2 und (p + b) / 2, zwei Buden bei a + 1 und b - 1 alle
+        gains = []
+        for number, start in enumerate(position):
+            stop = position[number + 1] if number + 1 < len(position) else position[0] + self.adresses
+            first = bisect_right(self.ring, start)
+            last = bisect_left(self.ring, stop)
+            window = 0
+            lower = first
+            for upper in range(first, last):    # zwischen die Mittelpunkte passen Häuser mit Abstand bis (b - a - 2) / 2
+                while 2 * (self.ring[upper] - self.ring[lower]) > stop - start - 2:
+                    lower += 1
+                window = max(window, upper - lower + 1)
+            gains.append(window)
+            gains.append(last - first - window)     # nie mehr als die erste Bude, daher genügt eine gierige Auswahl
+        return sum(sorted(gains, reverse=True)[:len(position)])
+
+    def min_preferred(self, position: Tuple[int, ...]) -> Optional[int]:
+        """ermittle, wie viele Häuser 'position' gegenüber einer Positionierung mit kleinerem Index mindestens bevorzugen,
+        None falls keine solche existiert"""
+        # eine kleinere Positionierung stimmt in den ersten Buden mit 'position' überein und besitzt danach eine kleinere Adresse,
+        # alle weiteren Buden liegen hinter dieser Adresse, jeder Bogen liegt dabei zwischen zwei benachbarten Buden von 'position'
+        arcs = self.arcs([int(distance) for distance in self.distances(position)], True)
+        best = -1
+        for number, stall in enumerate(position):
+            points = len(position) - number
+            low = position[number - 1] + 1 if number > 0 else 0
+            high = min(stall, self.adresses - points + 1)   # die weiteren Buden benötigen Platz hinter der ersten freien
+            if low >= high:
+                continue
+            if number > 0:
+                # Bögen ohne die übernommenen Buden liegen hinter der letzten von ihnen und bilden dort Intervalle
+                fixed = position[number - 1]
+                remaining = [arc for arc in arcs if not any(self.contains(arc, address) for address in position[:number])]
+                intervals = [(fixed + start, fixed + end) for start, end in self.clip(remaining, fixed, self.adresses - 1 - fixed)]
+                cases = [(len(arcs) - len(remaining), intervals, None)]
+            else:
+                # Bögen über die Adresse 0 hinweg enden an der ersten Bude, dann trifft sie die erste freie Bude immer, oder beginnen
+                # an der letzten Bude, dann trifft sie die erste freie Bude vor ihrem Ende oder eine Bude ab dieser Adresse,
+                # letzteres wird getrennt mit einer Bude ab der letzten Bude von 'position' untersucht
+                intervals, wrapping = [], []
+                for start, length in arcs:
+                    if start + length <= self.adresses:
+                        intervals.append((start, start + length - 1))
+                    else:
+                        wrapping.append((0, start + length - 1 - self.adresses))
+                cases = [(0, intervals + wrapping, None), (len(wrapping), intervals, position[-1])]
+            for covered, intervals, last in cases:
+                candidates = {low} if last is None else {low, last}
+                candidates.update(start for start, _ in intervals if start >= low)
+                candidates = sorted(candidates)
+                for candidate, value in zip(candidates, chain_coverage(intervals, candidates, points, last)):
+                    if candidate < high:
+                        best = max(best, covered + value)
+        return None if best < 0 else len(arcs) - int(best)
+
+    def stable(self, position: Tuple[int, ...]) -> bool:
+        """ermittle ohne Aufzählung der Herausforderer, ob 'position' wie bei main stabil ist"""
+        if not position:    # ohne Buden gibt es keine andere Position und damit keinen Herausforderer
+            return True
+        half = len(self.houses) / 2
+        if self.max_wins(position) > half:  # ACCEPTED gegen eine größere, FAILED gegen eine kleinere Positionierung
+            return False
+        preferred = self.min_preferred(position)    # FAILED gegen eine kleinere Positionierung, auch bei Gleichständen
+        return preferred is None or preferred >= half
+
+    def better(self, position: Tuple[int, ...]) -> Optional[Tuple[int, ...]]:
+        """ermittle eine andere Position, welche die Wahl gegen 'position' wie bei main gewinnt, oder None"""
+        if not position:    # siehe stable
+            return None
+        # anstatt aller Positionen wird nur eine Positionierung pro Kombination von Abschnitten untersucht
+        cells = self.cells([int(distance) for distance in self.distances(position)])
+        houses = len(self.houses)
+        half = houses / 2
+        smallest: List[int] = []    # kleinste Positionierung der aktuellen Kombination von Abschnitten
+
+        def search(cell: int, address: int, remaining: int, won: int, covered: int) -> bool:
+            if remaining == 0:
+                if won.bit_count() > half:  # ACCEPTED gegen 'position' als position1, damit auch FAILED als position2
+                    return True     # 'position' selbst gewinnt kein Haus, liegt also nicht in der Kombination
+                # FAILED gegen 'position' als position2, dafür muss eine Position der Kombination vor 'position' liegen
+                return houses - covered.bit_count() < half and tuple(smallest) < position
+            for number in range(cell, len(cells)):
+                start, stop, cell_won, cell_covered = cells[number]
+                if number != cell:
+                    address = start
+                if address < stop:
+                    smallest.append(address)
+                    if search(number, address + 1, remaining - 1, won | cell_won, covered | cell_covered):
+                        return True
+                    smallest.pop()
+            return False
+
+        if search(0, 0, len(position), 0, 0):
+            return tuple(smallest)
+        return None
+
+
+class NumpyVillage(Village):
+    """Dorf, dessen Wahlen mit einer Tabelle der Distanzen aller Häuser zu allen Adressen vektorisiert simuliert werden"""
+    __slots__ = ("table",)
+
+    table: "numpy.ndarray"  # Zeile n enthält die Distanzen aller Häuser zur Adresse n
+
+    def __init__(self, adresses: int, houses: List[int], budget: int = 0) -> None:
+        if numpy is None:
+            raise ImportError("NumpyVillage benötigt NumPy")
+        super().__init__(adresses, houses, budget)
+        distance1 = numpy.abs(numpy.arange(adresses)[:, numpy.newaxis] - numpy.asarray(houses, dtype=numpy.int64))
+        self.table = numpy.minimum(distance1, adresses - distance1).astype(numpy.min_scalar_type(adresses))
+
+    def compute_distances(self, position: Sequence[int]) -> "numpy.ndarray":
+        """ermittle die Distanzen aller Häuser zur jeweils nächsten Eisbude"""
+        return self.table[list(position)].min(axis=0)
+
+    def vector_size(self) -> int:
+        """ermittle den Speicherbedarf der Distanzen einer Position in Bytes"""
+        return self.table.itemsize * len(self.houses)
+
+    def approvals(self, position1: Tuple[int, ...], position2: Tuple[int, ...]) -> int:
+        """ermittle die Anzahl der Häuser, welche position2 gegenüber position1 bevorzugen"""
+        return int(numpy.count_nonzero(self.distances(position2) < self.distances(position1)))
+
+
+def vote_tile(village: Village, better_positions: MutableSequence[int], start1: int, block1: Sequence[Tuple[int, ...]],
+              start2: int, block2: Sequence[Tuple[int, ...]], stop: Optional[Sequence[int]] = None) -> None:
+    """simuliere alle Wahlen zwischen zwei Blöcken von Positionen, bei einem gesetzten 'stop[0]' wird abgebrochen"""
+    for index1, position1 in enumerate(block1, start=start1):
+        if stop is not None and stop[0]:
+            return
+        for index2 in range(max(index1 + 1, start2), start2 + len(block2)):    # teste alle Kombinationen
+            vote = village.simulate_vote(position1, block2[index2 - start2])
             if vote is VoteResult.ACCEPTED:        # erhöhe die Anzahl an besseren Positionierungen des Verlierers um 1
                 better_positions[index1] += 1
             elif vote is VoteResult.FAILED:
                 better_positions[index2] += 1
-        if better_positions[index1] == 0:   # Positionierung ist stabil
-            print("stabile Position:", position1)
+
+
+def main(positions: Sequence[Tuple[int, ...]], village: Village, lazy: bool, block: int = 4096) -> None:
+    """Brute-Force Implementierung"""
+    # speichere für jede Positionierung die Anzahl an besseren Positionierungen
+    better_positions = counter_array(len(positions), "I" if len(positions) < 1 << 32 else "Q")
+    # vergleiche die Positionen blockweise, damit nur die Positionen zweier Blöcke gleichzeitig gespeichert werden,
+    # mit Cache werden die Blöcke so gewählt, dass die Distanzen beider Blöcke gleichzeitig in den Cache passen
+    capacity = village.capacity()
+    if capacity is not None:
+        block = max(capacity // 2, 1)
+    for start1 in range(0, len(positions), block):
+        block1 = positions[start1:start1 + block]
+        for start2 in range(start1, len(positions), block):
+            block2 = block1 if start2 == start1 else positions[start2:start2 + block]
+            vote_tile(village, better_positions, start1, block1, start2, block2)
+        # alle Wahlen der Positionen des Blocks wurden simuliert
+        for index1, position1 in enumerate(block1, start=start1):
+            if better_positions[index1] == 0:   # Positionierung ist stabil
+                print("stabile Position:", position1)
+                if lazy:
+                    return
+
+
+worker: Dict[str, Any] = {}     # Zustand der Prozesse von parallel_main, wird von init_worker gesetzt
+
+
+def init_worker(village: Village, positions: Sequence[Tuple[int, ...]], name: str, typecode: str, block: int) -> None:
+    """initialisiere einen Prozess von parallel_main und verbinde ihn mit den gemeinsamen Zählern"""
+    shared = SharedMemory(name)
+    size = array(typecode).itemsize * len(positions)
+    worker.update(
+        village=village,
+        positions=positions,
+        shared=shared,  # muss referenziert bleiben, solange die Zähler benutzt werden
+        better_positions=shared.buf[:size].cast(typecode),
+        stop=shared.buf[size:size + 1],
+        block=block
+    )
+
+
+def solve_tile(tile: Tuple[int, int]) -> Tuple[int, int]:
+    """simuliere die Wahlen eines Paares von Blöcken, wird von den Prozessen aufgerufen"""
+    start1, start2 = tile
+    positions, block = worker["positions"], worker["block"]
+    block1 = positions[start1:start1 + block]
+    block2 = block1 if start2 == start1 else positions[start2:start2 + block]
+    vote_tile(worker["village"], worker["better_positions"], start1, block1, start2, block2, worker["stop"])
+    return tile
+
+
+def parallel_main(positions: Sequence[Tuple[int, ...]], village: Village, lazy: bool, processes: Optional[int] = None, block: int = 4096) -> None:
+    """Brute-Force Implementierung, deren Paare von Blöcken auf mehrere Prozesse verteilt werden"""
+    # die Zähler liegen im gemeinsamen Speicher, gleichzeitige Erhöhungen können verloren gehen,
+    # ein Zähler bleibt jedoch nie fälschlicherweise 0, weshalb genau dieselben Positionen als stabil ausgegeben werden
+    import multiprocessing  # wird nur hier benötigt und verlängert sonst den Start
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    capacity = village.capacity()
+    if capacity is not None:
+        block = max(capacity // 2, 1)
+    # mindestens etwa acht Paare von Blöcken pro Prozess, damit die Prozesse gleichmäßig ausgelastet werden
+    block = max(min(block, -(-len(positions) // isqrt(16 * processes))), 1)
+    typecode = "I" if len(positions) < 1 << 32 else "Q"
+    size = array(typecode).itemsize * len(positions)
+    shared = SharedMemory(create=True, size=size + 1)   # das letzte Byte signalisiert den Abbruch
+    better_positions = shared.buf[:size].cast(typecode)
+    stop = shared.buf[size:size + 1]
+    try:
+        better_positions[:] = array(typecode, bytes(size))
+        stop[0] = 0
+        starts = range(0, len(positions), block)
+        pending = [len(starts)] * len(starts)   # Anzahl der noch offenen Paare von Blöcken, welche die Positionen eines Blocks enthalten
+        finished = 0    # Anzahl der Blöcke, deren stabile Positionen bereits ausgegeben wurden
+        tiles = ((start1, start2) for start1 in starts for start2 in starts if start2 >= start1)
+        with multiprocessing.Pool(processes, initializer=init_worker, initargs=(village, positions, shared.name, typecode, block)) as pool:
+            for start1, start2 in pool.imap_unordered(solve_tile, tiles):
+                pending[start1 // block] -= 1
+                if start2 != start1:
+                    pending[start2 // block] -= 1
+                # gebe die Blöcke in ihrer Reihenfolge aus, sobald alle ihre Wahlen simuliert wurden
+                while finished < len(starts) and pending[finished] == 0:
+                    for index, position in enumerate(positions[starts[finished]:starts[finished] + block], start=starts[finished]):
+                        if better_positions[index] == 0:    # Positionierung ist stabil
+                            print("stabile Position:", position)
+                            if lazy:
+                                stop[0] = 1     # die anderen Prozesse brechen ihre Blöcke ab
+                                pool.terminate()
+                                return
+                    finished += 1
+    finally:
+        better_positions.release()
+        stop.release()
+        shared.close()
+        shared.unlink()
+
+
+def pruned_main(positions: Sequence[Tuple[int, ...]], village: Village, lazy: bool, challengers: int = 16, representatives: bool = False) -> None:
+    """Implementierung, welche nur Wahlen für Positionen simuliert, deren Stabilität noch nicht widerlegt wurde"""
+    # jede Wahl zwischen zwei Positionen wird wie bei main mit der Position mit kleinerem Index als position1 simuliert,
+    # daher werden genau dieselben Positionen als stabil ausgegeben
+    unstable = counter_array(len(positions), "B")   # speichere für jede Positionierung, ob bereits eine bessere gefunden wurde
+    strong: List[Tuple[int, Tuple[int, ...]]] = []  # Positionen, welche zuletzt andere Positionen geschlagen haben, die erfolgreichste zuerst
+
+    def promote(challenger: int, challenger_position: Tuple[int, ...]) -> None:
+        """setze einen erfolgreichen Herausforderer an die Spitze der starken Positionen"""
+        entry = (challenger, challenger_position)
+        if entry in strong:
+            strong.remove(entry)
+        strong.insert(0, entry)
+        del strong[challengers:]
+
+    def beaten(index: int, position: Tuple[int, ...], challenger: int, challenger_position: Tuple[int, ...]) -> bool:
+        """simuliere die Wahl zweier Positionen, merke das Ergebnis und ermittle, ob 'challenger' besser ist"""
+        if index < challenger:
+            index1, index2, vote = index, challenger, village.simulate_vote(position, challenger_position)
+        else:
+            index1, index2, vote = challenger, index, village.simulate_vote(challenger_position, position)
+        if vote is VoteResult.ACCEPTED:     # position1 ist nicht stabil
+            unstable[index1] = True
+            loser = index1
+        elif vote is VoteResult.FAILED:     # position2 ist nicht stabil
+            unstable[index2] = True
+            loser = index2
+        else:
+            return False
+        if loser == index:
+            promote(challenger, challenger_position)
+            return True
+        return False
+
+    for index, position in enumerate(positions):
+        if unstable[index]:     # eine bessere Position wurde bereits bei einer früheren Wahl gefunden
+            continue
+        # versuche die Position zuerst mit starken Herausforderern zu schlagen, erst danach mit allen anderen
+        tried = [entry for entry in strong if entry[0] != index]
+        if any(beaten(index, position, *entry) for entry in tried):
+            continue
+        if representatives:     # durchsuche nur eine Position pro Kombination von Abschnitten des Rings
+            challenger_position = village.better(position)
+            if challenger_position is not None:     # der gefundene Herausforderer wird auch gegen die folgenden Positionen versucht
+                promote(positions.index(challenger_position), challenger_position)
+                continue
+        else:
+            tried_set = {challenger for challenger, _ in tried}
+            if any(beaten(index, position, challenger, challenger_position) for challenger, challenger_position in enumerate(positions)
+                   if challenger != index and challenger not in tried_set):
+                continue
+        print("stabile Position:", position)
+        if lazy:
+            break
+
+
+def anytime_main(positions: PositionSpace, village: Village, lazy: bool, seconds: Optional[float] = None, votes: Optional[int] = None,
+                 seed: int = 0, exact_limit: int = 10 ** 6, report: int = 5) -> None:
+    """lokale Suche nach stabilen Positionen, welche nach Ablauf der Zeit oder der Wahlen die besten Kandidaten ausgibt"""
+    # eine Position wird wie bei main von einem Herausforderer geschlagen, dabei entscheidet der Index, welche Regel gilt
+    deadline = None if seconds is None else time.monotonic() + seconds
+    rng = Random(seed)
+    half = len(village.houses) / 2
+    stalls = positions.stalls
+    simulated = 0   # Anzahl der simulierten Wahlen
+    # untersuchte, nicht bestätigte Positionen -> deutlichster Sieg eines Herausforderers (0 falls keiner gewinnt)
+    # und Anzahl der Herausforderer, gegen welche sie bestehen
+    scores: Dict[Tuple[int, ...], Tuple[float, int]] = {}
+    confirmed: List[Tuple[int, ...]] = []
+    visited = set()
+
+    def exhausted() -> bool:
+        return (votes is not None and simulated >= votes) or (deadline is not None and time.monotonic() >= deadline)
+
+    def margin(position: Tuple[int, ...], index: int, challenger: Tuple[int, ...]) -> Optional[float]:
+        """gebe zurück, wie deutlich 'challenger' die Position schlägt, oder None, falls er sie nicht schlägt"""
+        nonlocal simulated
+        simulated += 1
+        if positions.index(challenger) > index:     # ACCEPTED mit der Position als position1
+            approved = village.approvals(position, challenger)
+            return approved - half if approved > half else None
+        approved = village.approvals(challenger, position)  # FAILED mit der Position als position2
+        return half - approved if approved < half else None
+
+    def random_position() -> Tuple[int, ...]:
+        return tuple(sorted(rng.sample(range(village.adresses), stalls)))
+
+    if stalls == 0 or len(positions) < 2:
+        return main(positions, village, lazy)   # es gibt keine Nachbarn
+    position = random_position()
+    while not exhausted():
+        visited.add(position)
+        index = positions.index(position)
+        # Nachbarn verschieben eine Bude an eine andere Adresse, der deutlichste Sieger wird die nächste Position
+        best: Optional[Tuple[int, ...]] = None
+        best_margin = 0.0
+        survived = 0
+        occupied = set(position)
+        for stall in rng.sample(range(stalls), stalls):
+            for address in rng.sample(range(village.adresses), village.adresses):
+                if exhausted():
+                    break
+                if address in occupied:
+                    continue
+                challenger = tuple(sorted(occupied - {position[stall]} | {address}))
+                result = margin(position, index, challenger)
+                if result is None:
+                    survived += 1
+                elif best is None or result > best_margin:
+                    best, best_margin = challenger, result
+            if exhausted():
+                break
+        scores[position] = (best_margin, survived)
+        if best is None:    # die Position ist lokal stabil, versuche sie exakt zu bestätigen
+            if exhausted():
+                break
+            cells = village.cells([int(distance) for distance in village.distances(position)])
+            if comb(len(cells) + stalls - 1, stalls) <= exact_limit:
+                best = village.better(position)
+                if best is None:
+                    del scores[position]
+                    confirmed.append(position)
+                    print("stabile Position:", position)
+                    if lazy:
+                        return
+                else:   # ein entfernter Herausforderer schlägt die Position
+                    scores[position] = (margin(position, index, best), survived)
+        if best is None or best in visited:     # Kreis oder Sackgasse, beginne an einer zufälligen Position neu
+            if len(visited) == len(positions):  # alle Positionen wurden untersucht
+                break
+            best = random_position()
+            while best in visited:
+                best = random_position()
+        position = best
+    # die besten Kandidaten werden am knappsten oder gar nicht geschlagen, bei Gleichstand zählen die bestandenen Wahlen
+    candidates = sorted(scores.items(), key=lambda item: (item[1][0], -item[1][1]))[:report]
+    print(f"Suche nach {simulated} Wahlen beendet, {len(confirmed)} stabile Positionen bestätigt")
+    for candidate, (defeat, challengers) in candidates:
+        details = f", deutlichste Niederlage {defeat:g} Stimmen jenseits der Hälfte" if defeat else ""
+        print(f"Kandidat: {candidate} (ungeschlagen gegen {challengers} von {len(positions) - 1} Herausforderern{details})")
+
+
+def oracle_main(positions: Sequence[Tuple[int, ...]], village: Village, lazy: bool) -> None:
+    """Implementierung, welche jede Position einzeln mit Village.stable prüft, ohne Wahlen zu simulieren"""
+    for position in positions:
+        if village.stable(position):
+            print("stabile Position:", position)
             if lazy:
                 break
 
 
 if __name__ == "__main__":
     args = argparser.parse_args()
+    if args.representatives and not args.pruned:
+        argparser.error("--representatives benötigt --pruned")
     adresses, houses = parse_input(args.Datei)
-    village = Village(adresses, list(houses))
-    positions = list(village.positions(args.stalls))
-    main(positions, village, args.lazy)
+    if args.numpy:
+        if numpy is None:
+            argparser.error("--numpy benötigt NumPy")
+        village = NumpyVillage(adresses, list(houses), int(args.cache * 2 ** 20))
+    else:
+        village = Village(adresses, list(houses), int(args.cache * 2 ** 20))
+    positions = village.positions(args.stalls)
+    if args.time is not None or args.votes is not None:
+        anytime_main(positions, village, args.lazy, args.time, args.votes, args.seed)
+    elif args.oracle:
+        oracle_main(positions, village, args.lazy)
+    elif args.pruned:
+        pruned_main(positions, village, args.lazy, representatives=args.representatives)
+    elif args.processes is not None:
+        parallel_main(positions, village, args.lazy, args.processes)
+    else:
+        main(positions, village, args.lazy)